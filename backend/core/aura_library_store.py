@@ -1,14 +1,60 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import operator
 import os
 import sys
+import threading
 import time
+from pathlib import Path
 from typing import Any
 
+from backend.core.aura_sqlite import AuraDB, db_path_for, get_db
+from backend.core.json_file import atomic_write, dumps, loads
 from backend.core.paths import app_data_dir
 
 
+# Parsed store shared across calls; re-read only when the file's stat changes.
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": 0, "size": -1, "data": None}
+_LOCK = threading.RLock()
+
+# Mutations only mark the cache dirty; one write per debounce window persists them.
+_FLUSH_DELAY_SEC = 0.2
+_dirty = False
+_flush_timer: threading.Timer | None = None
+
+# History rows and folder membership live in SQLite; the JSON file keeps folder metadata and notes.
+_HISTORY_UPSERT = """
+INSERT INTO history (user, album_id, ts, photo_id, title, album_title, page_index)
+VALUES (:user, :album_id, :ts, :photo_id, :title, :album_title, :page_index)
+ON CONFLICT (user, album_id) DO UPDATE SET
+    ts = excluded.ts,
+    photo_id = CASE WHEN excluded.photo_id != '' THEN excluded.photo_id ELSE history.photo_id END,
+    title = CASE WHEN excluded.title != '' THEN excluded.title ELSE history.title END,
+    album_title = CASE WHEN excluded.album_title != '' THEN excluded.album_title ELSE history.album_title END,
+    page_index = CASE WHEN :has_page THEN excluded.page_index ELSE history.page_index END
+"""
+_HISTORY_IMPORT = """
+INSERT INTO history (user, album_id, ts, photo_id, title, album_title, page_index)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user, album_id) DO UPDATE SET
+    ts = excluded.ts,
+    photo_id = excluded.photo_id,
+    title = excluded.title,
+    album_title = excluded.album_title,
+    page_index = excluded.page_index
+WHERE excluded.ts > history.ts
+"""
+
+
+def _clean(s: Any) -> str:
+    if isinstance(s, str):
+        return s.strip()
+    return "" if s is None else str(s).strip()
+
+
+@functools.lru_cache(maxsize=1)
 def _store_path() -> str:
     if os.environ.get("JM_AURA_AURA_LIBRARY_PATH"):
         return os.environ["JM_AURA_AURA_LIBRARY_PATH"]
@@ -18,13 +64,17 @@ def _store_path() -> str:
     return os.path.join(base_dir, "backend", "config", "aura_library.json")
 
 
-def _load_raw() -> dict[str, Any]:
-    p = _store_path()
-    if not os.path.exists(p):
-        return {"v": 1, "users": {}}
+def _stat_sig(p: str) -> tuple[int, int]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return 0, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(p: str) -> dict[str, Any]:
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            v = json.load(f)
+        v = loads(Path(p).read_bytes())
         if not isinstance(v, dict):
             return {"v": 1, "users": {}}
         if "users" not in v or not isinstance(v.get("users"), dict):
@@ -34,15 +84,144 @@ def _load_raw() -> dict[str, Any]:
         return {"v": 1, "users": {}}
 
 
+def _db() -> AuraDB:
+    return get_db(db_path_for(_store_path()))
+
+
+def _import_legacy(raw: dict[str, Any]) -> bool:
+    # Older files carry history and folder album_ids inline; move them into SQLite once.
+    history_rows = []
+    item_rows = []
+    for u, b in raw["users"].items():
+        if not isinstance(b, dict):
+            continue
+        h = b.get("history")
+        if isinstance(h, dict):
+            for aid, v in h.items():
+                if not isinstance(v, dict) or not _clean(aid):
+                    continue
+                try:
+                    page = max(0, int(v.get("page_index") or 0))
+                except Exception:
+                    page = 0
+                history_rows.append(
+                    (
+                        u,
+                        _clean(aid),
+                        int(v.get("timestamp") or 0),
+                        str(v.get("photo_id") or ""),
+                        str(v.get("title") or ""),
+                        str(v.get("album_title") or ""),
+                        page,
+                    )
+                )
+        folders = b.get("folders")
+        if isinstance(folders, dict):
+            for fid, f in folders.items():
+                if not isinstance(f, dict):
+                    continue
+                ids = f.get("album_ids")
+                if isinstance(ids, list):
+                    item_rows.extend((u, fid, x) for x in map(_clean, ids) if x)
+    if not history_rows and not item_rows:
+        return False
+    with _db().tx() as conn:
+        conn.executemany(_HISTORY_IMPORT, history_rows)
+        conn.executemany("INSERT OR IGNORE INTO folder_items (user, folder_id, album_id) VALUES (?, ?, ?)", item_rows)
+    # Drop the inline copies only once SQLite holds them, so a failed import retries on next load.
+    for b in raw["users"].values():
+        if not isinstance(b, dict):
+            continue
+        b.pop("history", None)
+        folders = b.get("folders")
+        if isinstance(folders, dict):
+            for f in folders.values():
+                if isinstance(f, dict):
+                    f.pop("album_ids", None)
+                    f.pop("count", None)
+    return True
+
+
+def _intern_keys(raw: dict[str, Any]) -> None:
+    # Folder ids and album ids repeat across users' folders and notes; share one string object each.
+    interned: dict[str, Any] = {}
+    for u, b in raw["users"].items():
+        if isinstance(b, dict):
+            for name in ("folders", "notes"):
+                sect = b.get(name)
+                if isinstance(sect, dict):
+                    b[name] = {sys.intern(k): v for k, v in sect.items()}
+        interned[sys.intern(u)] = b
+    raw["users"] = interned
+
+
+def _load_raw() -> dict[str, Any]:
+    # Returns the shared cached dict; mutators edit it in place under _LOCK and call _mark_dirty.
+    p = _store_path()
+    with _LOCK:
+        if _dirty and _CACHE["data"] is not None:
+            return _CACHE["data"]
+        mtime_ns, size = _stat_sig(p)
+        if (
+            _CACHE["data"] is not None
+            and _CACHE["path"] == p
+            and _CACHE["mtime_ns"] == mtime_ns
+            and _CACHE["size"] == size
+        ):
+            return _CACHE["data"]
+        data = _read_file(p)
+        _intern_keys(data)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+        if _import_legacy(data):
+            _mark_dirty()
+        return data
+
+
 def _save_raw(data: dict[str, Any]) -> None:
     p = _store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    try:
-        os.chmod(p, 0o600)
-    except Exception:
-        pass
+    with _LOCK:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        atomic_write(p, dumps(data), chmod=0o600)
+        mtime_ns, size = _stat_sig(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+
+
+def _mark_dirty() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        _dirty = True
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_DELAY_SEC, flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        t = _flush_timer
+        _flush_timer = None
+        if t is not None and t is not threading.current_thread():
+            t.cancel()
+        data = _CACHE["data"]
+        if not _dirty or data is None:
+            return
+        _dirty = False
+        try:
+            _save_raw(data)
+        except Exception:
+            _dirty = True
+            raise
+
+
+atexit.register(flush)
+
+
+def _user_key(user: str) -> str:
+    u = _clean(user)
+    if not u:
+        raise ValueError("Missing user")
+    return sys.intern(u)
 
 
 def _user_bucket(raw: dict[str, Any], user: str) -> dict[str, Any]:
@@ -50,15 +229,11 @@ def _user_bucket(raw: dict[str, Any], user: str) -> dict[str, Any]:
     if not isinstance(users, dict):
         users = {}
         raw["users"] = users
-    u = str(user or "").strip()
-    if not u:
-        raise ValueError("Missing user")
+    u = _user_key(user)
     b = users.get(u)
     if not isinstance(b, dict):
         b = {}
         users[u] = b
-    if "history" not in b or not isinstance(b.get("history"), dict):
-        b["history"] = {}
     if "folders" not in b or not isinstance(b.get("folders"), dict):
         b["folders"] = {}
     if "notes" not in b or not isinstance(b.get("notes"), dict):
@@ -66,6 +241,13 @@ def _user_bucket(raw: dict[str, Any], user: str) -> dict[str, Any]:
     return b
 
 
+def _peek_user_bucket(raw: dict[str, Any], user: str) -> dict[str, Any]:
+    # Read-only counterpart of _user_bucket: never inserts into the shared cached dict.
+    users = raw.get("users")
+    b = users.get(_user_key(user)) if isinstance(users, dict) else None
+    return b if isinstance(b, dict) else {}
+
+
 def push_history(
     user: str,
     album_id: str,
@@ -76,205 +258,194 @@ def push_history(
     page_index: int | None = None,
     ts: int | None = None,
 ) -> None:
-    aid = str(album_id or "").strip()
+    aid = _clean(album_id)
     if not aid:
         raise ValueError("Missing album_id")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    h = b["history"]
-    now = int(ts or time.time() * 1000)
-    rec = h.get(aid)
-    if not isinstance(rec, dict):
-        rec = {}
-        h[aid] = rec
-    if album_title:
-        rec["album_title"] = str(album_title)
-    if photo_id:
-        rec["photo_id"] = str(photo_id)
-    if title:
-        rec["title"] = str(title)
+    page = 0
     if page_index is not None:
         try:
-            rec["page_index"] = max(0, int(page_index))
+            page = max(0, int(page_index))
         except Exception:
-            rec["page_index"] = 0
-    rec["timestamp"] = now
-    _save_raw(raw)
+            page = 0
+    params = {
+        "user": _user_key(user),
+        "album_id": aid,
+        "ts": int(ts or time.time() * 1000),
+        "photo_id": str(photo_id or ""),
+        "title": str(title or ""),
+        "album_title": str(album_title or ""),
+        "page_index": page,
+        "has_page": page_index is not None,
+    }
+    with _db().tx() as conn:
+        conn.execute(_HISTORY_UPSERT, params)
 
 
 def list_history(user: str, *, limit: int = 50) -> list[dict[str, Any]]:
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    h = b.get("history")
-    if not isinstance(h, dict):
-        return []
-    out = []
-    for aid, v in h.items():
-        if not isinstance(v, dict):
-            continue
-        out.append(
-            {
-                "album_id": str(aid),
-                "album_title": str(v.get("album_title") or ""),
-                "photo_id": str(v.get("photo_id") or ""),
-                "title": str(v.get("title") or ""),
-                "page_index": max(0, int(v.get("page_index") or 0)),
-                "timestamp": int(v.get("timestamp") or 0),
-            }
-        )
-    out.sort(key=lambda x: int(x.get("timestamp") or 0), reverse=True)
-    return out[: max(1, int(limit or 50))]
+    _load_raw()  # imports legacy inline history on first use
+    rows = _db().query(
+        "SELECT album_id, album_title, photo_id, title, page_index, ts FROM history"
+        " WHERE user = ? ORDER BY ts DESC LIMIT ?",
+        (_user_key(user), max(1, int(limit or 50))),
+    )
+    return [
+        {
+            "album_id": aid,
+            "album_title": album_title,
+            "photo_id": photo_id,
+            "title": title,
+            "page_index": page_index,
+            "timestamp": ts,
+        }
+        for aid, album_title, photo_id, title, page_index, ts in rows
+    ]
 
 
 def create_folder(user: str, name: str) -> dict[str, Any]:
-    n = str(name or "").strip()
+    n = _clean(name)
     if not n:
         raise ValueError("Missing folder name")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b["folders"]
-    fid = f"f_{int(time.time()*1000)}"
-    folders[fid] = {"id": fid, "name": n, "album_ids": [], "created_at": int(time.time())}
-    _save_raw(raw)
-    return folders[fid]
+    with _LOCK:
+        raw = _load_raw()
+        b = _user_bucket(raw, user)
+        folders = b["folders"]
+        fid = f"f_{int(time.time()*1000)}"
+        folders[fid] = {"id": fid, "name": n, "created_at": int(time.time())}
+        _mark_dirty()
+        return {**folders[fid], "album_ids": []}
 
 
 def rename_folder(user: str, folder_id: str, name: str) -> None:
-    fid = str(folder_id or "").strip()
-    n = str(name or "").strip()
+    fid = _clean(folder_id)
+    n = _clean(name)
     if not fid or not n:
         raise ValueError("Missing folder_id or name")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b["folders"]
-    f = folders.get(fid)
-    if not isinstance(f, dict):
-        raise ValueError("Folder not found")
-    f["name"] = n
-    _save_raw(raw)
+    with _LOCK:
+        raw = _load_raw()
+        b = _user_bucket(raw, user)
+        folders = b["folders"]
+        f = folders.get(fid)
+        if not isinstance(f, dict):
+            raise ValueError("Folder not found")
+        f["name"] = n
+        _mark_dirty()
 
 
 def delete_folder(user: str, folder_id: str) -> None:
-    fid = str(folder_id or "").strip()
+    fid = _clean(folder_id)
     if not fid:
         raise ValueError("Missing folder_id")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b["folders"]
-    folders.pop(fid, None)
-    _save_raw(raw)
+    with _LOCK:
+        raw = _load_raw()
+        b = _user_bucket(raw, user)
+        folders = b["folders"]
+        folders.pop(fid, None)
+        _mark_dirty()
+        with _db().tx() as conn:
+            conn.execute("DELETE FROM folder_items WHERE user = ? AND folder_id = ?", (_user_key(user), fid))
 
 
 def toggle_folder_item(user: str, folder_id: str, album_id: str, present: bool) -> None:
-    fid = str(folder_id or "").strip()
-    aid = str(album_id or "").strip()
+    fid = _clean(folder_id)
+    aid = _clean(album_id)
     if not fid or not aid:
         raise ValueError("Missing folder_id or album_id")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b["folders"]
-    f = folders.get(fid)
-    if not isinstance(f, dict):
-        raise ValueError("Folder not found")
-    ids = f.get("album_ids")
-    if not isinstance(ids, list):
-        ids = []
-        f["album_ids"] = ids
-    s = set(str(x) for x in ids if str(x))
-    if present:
-        s.add(aid)
-    else:
-        s.discard(aid)
-    f["album_ids"] = sorted(s)
-    _save_raw(raw)
+    with _LOCK:
+        raw = _load_raw()
+        folders = _peek_user_bucket(raw, user).get("folders")
+        f = folders.get(fid) if isinstance(folders, dict) else None
+        if not isinstance(f, dict):
+            raise ValueError("Folder not found")
+        if present:
+            sql = "INSERT OR IGNORE INTO folder_items (user, folder_id, album_id) VALUES (?, ?, ?)"
+        else:
+            sql = "DELETE FROM folder_items WHERE user = ? AND folder_id = ? AND album_id = ?"
+        with _db().tx() as conn:
+            conn.execute(sql, (_user_key(user), fid, aid))
 
 
 def list_folders(user: str) -> list[dict[str, Any]]:
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b.get("folders")
-    if not isinstance(folders, dict):
-        return []
-    out = []
-    for fid, f in folders.items():
-        if not isinstance(f, dict):
-            continue
-        ids = f.get("album_ids")
-        out.append(
-            {
-                "id": str(fid),
-                "name": str(f.get("name") or ""),
-                "count": len(ids) if isinstance(ids, list) else 0,
-            }
+    with _LOCK:
+        raw = _load_raw()
+        b = _peek_user_bucket(raw, user)
+        folders = b.get("folders")
+        if not isinstance(folders, dict):
+            return []
+        meta = [(str(fid), str(f.get("name") or "")) for fid, f in folders.items() if isinstance(f, dict)]
+    counts = dict(
+        _db().query(
+            "SELECT folder_id, COUNT(*) FROM folder_items WHERE user = ? GROUP BY folder_id",
+            (_user_key(user),),
         )
-    out.sort(key=lambda x: x["name"])
+    )
+    out = [{"id": fid, "name": name, "count": counts.get(fid, 0)} for fid, name in meta]
+    out.sort(key=operator.itemgetter("name"))
     return out
 
 
 def list_folders_with_album_ids(user: str) -> list[dict[str, Any]]:
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    folders = b.get("folders")
-    if not isinstance(folders, dict):
-        return []
+    with _LOCK:
+        raw = _load_raw()
+        b = _peek_user_bucket(raw, user)
+        folders = b.get("folders")
+        if not isinstance(folders, dict):
+            return []
+        meta = [(str(fid), str(f.get("name") or "")) for fid, f in folders.items() if isinstance(f, dict)]
+    items: dict[str, list[str]] = {}
+    for fid, aid in _db().query(
+        "SELECT folder_id, album_id FROM folder_items WHERE user = ? ORDER BY folder_id, album_id",
+        (_user_key(user),),
+    ):
+        items.setdefault(fid, []).append(aid)
     out = []
-    for fid, f in folders.items():
-        if not isinstance(f, dict):
-            continue
-        ids = f.get("album_ids")
-        album_ids = [str(x) for x in ids] if isinstance(ids, list) else []
-        album_ids = [x.strip() for x in album_ids if str(x).strip()]
-        out.append(
-            {
-                "id": str(fid),
-                "name": str(f.get("name") or ""),
-                "album_ids": sorted(set(album_ids)),
-                "count": len(set(album_ids)),
-            }
-        )
-    out.sort(key=lambda x: x["name"])
+    for fid, name in meta:
+        ids = items.get(fid, [])
+        out.append({"id": fid, "name": name, "album_ids": ids, "count": len(ids)})
+    out.sort(key=operator.itemgetter("name"))
     return out
 
 
 def set_note(user: str, album_id: str, *, tags: list[str] | None = None, note: str = "") -> None:
-    aid = str(album_id or "").strip()
+    aid = _clean(album_id)
     if not aid:
         raise ValueError("Missing album_id")
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    notes = b["notes"]
-    rec = notes.get(aid)
-    if not isinstance(rec, dict):
-        rec = {}
-        notes[aid] = rec
-    if isinstance(tags, list):
-        cleaned = []
-        for t in tags:
-            s = str(t or "").strip()
-            if s and len(s) <= 24:
-                cleaned.append(s)
-        uniq = []
-        for x in cleaned:
-            if x not in uniq:
-                uniq.append(x)
-        rec["tags"] = uniq[:20]
-    if isinstance(note, str):
-        rec["note"] = note[:2000]
-    rec["updated_at"] = int(time.time())
-    _save_raw(raw)
+    with _LOCK:
+        raw = _load_raw()
+        b = _user_bucket(raw, user)
+        notes = b["notes"]
+        rec = notes.get(aid)
+        if not isinstance(rec, dict):
+            rec = {}
+            notes[aid] = rec
+        if isinstance(tags, list):
+            cleaned = []
+            for t in tags:
+                s = _clean(t)
+                if s and len(s) <= 24:
+                    cleaned.append(s)
+            uniq = []
+            for x in cleaned:
+                if x not in uniq:
+                    uniq.append(x)
+            rec["tags"] = uniq[:20]
+        if isinstance(note, str):
+            rec["note"] = note[:2000]
+        rec["updated_at"] = int(time.time())
+        _mark_dirty()
 
 
 def get_note(user: str, album_id: str) -> dict[str, Any]:
-    aid = str(album_id or "").strip()
+    aid = _clean(album_id)
     if not aid:
         return {}
-    raw = _load_raw()
-    b = _user_bucket(raw, user)
-    notes = b.get("notes")
-    if not isinstance(notes, dict):
-        return {}
-    rec = notes.get(aid)
-    return rec if isinstance(rec, dict) else {}
+    with _LOCK:
+        raw = _load_raw()
+        b = _peek_user_bucket(raw, user)
+        notes = b.get("notes")
+        if not isinstance(notes, dict):
+            return {}
+        rec = notes.get(aid)
+        return rec if isinstance(rec, dict) else {}
 
 
 def summary(user: str) -> dict[str, Any]:
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import sqlite3
+import threading
+from typing import Any, Iterator
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    user TEXT NOT NULL,
+    album_id TEXT NOT NULL,
+    ts INTEGER NOT NULL DEFAULT 0,
+    photo_id TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    album_title TEXT NOT NULL DEFAULT '',
+    page_index INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, album_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS history_user_ts ON history (user, ts DESC);
+CREATE TABLE IF NOT EXISTS favorites (
+    user TEXT NOT NULL,
+    album_id TEXT NOT NULL,
+    PRIMARY KEY (user, album_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS folder_items (
+    user TEXT NOT NULL,
+    folder_id TEXT NOT NULL,
+    album_id TEXT NOT NULL,
+    PRIMARY KEY (user, folder_id, album_id)
+) WITHOUT ROWID;
+"""
+
+
+class AuraDB:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def query(self, sql: str, params: Any = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextlib.contextmanager
+    def tx(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+
+_DBS: dict[str, AuraDB] = {}
+_DBS_LOCK = threading.Lock()
+
+
+def db_path_for(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + ".db"
+
+
+def get_db(path: str) -> AuraDB:
+    with _DBS_LOCK:
+        db = _DBS.get(path)
+        if db is None:
+            db = AuraDB(path)
+            _DBS[path] = db
+        return db
@@ -1,15 +1,47 @@
+import functools
+import hashlib
 import json
+import mmap
 import os
+import re
 import sys
+import threading
+from collections import OrderedDict
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.utils import cookiejar_from_dict, dict_from_cookiejar
+from urllib3.util.retry import Retry
 
+from backend.core import json_file
 from backend.core.paths import app_data_dir
-from backend.core.jm_context import current_jm_identity
+from backend.core.jm_context import current_jm_identity, current_jm_session
 
 
-_SESSIONS: dict[str, requests.Session] = {}
+_MAX_SESSIONS = 512
+_SESSIONS: OrderedDict[str, requests.Session] = OrderedDict()
+_SESSIONS_LOCK = threading.Lock()
+
+# 增加超时和重试机制，防止外部API卡死进程；所有会话共用同一组连接池
+_RETRY = Retry(
+    total=2,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=["HEAD", "GET", "OPTIONS"],
+)
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_RETRY, pool_block=False)
+_HTTPS_ADAPTER = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=_RETRY, pool_block=False)
+
+# \w is Unicode-aware and matches exactly str.isalnum() plus "_".
+_UNSAFE_KEY_CHARS = re.compile(r"[^\w.@-]")
+
+# Keyed by cookie file path: digest of the last jar synced with disk and the file's mtime then.
+_COOKIE_SIG: dict[str, bytes] = {}
+_COOKIE_MTIME: dict[str, int] = {}
+
+# Below this size a plain read is cheaper than setting up a mapping.
+_MMAP_MIN_BYTES = 4096
+
 
 def _is_guest_identity(user: str | None) -> bool:
     u = str(user or "").strip()
@@ -20,15 +52,10 @@ def _safe_user_key(user: str) -> str:
     s = str(user or "").strip()
     if not s:
         return "anon"
-    out = []
-    for ch in s:
-        if ch.isalnum() or ch in ("-", "_", ".", "@"):
-            out.append(ch)
-        else:
-            out.append("_")
-    return "".join(out)[:80] or "anon"
+    return sys.intern(_UNSAFE_KEY_CHARS.sub("_", s)[:80] or "anon")
 
 
+@functools.lru_cache(maxsize=256)
 def _cookie_file_path(user: str) -> str:
     if os.environ.get("JM_AURA_COOKIE_PATH"):
         base = os.environ["JM_AURA_COOKIE_PATH"]
@@ -48,46 +75,68 @@ def _get_user(user: str | None) -> str:
 
 
 def get_session(user: str | None = None) -> requests.Session:
+    if user is None:
+        cur = current_jm_session.get()
+        if cur is not None:
+            return cur
     u = _get_user(user)
     key = _safe_user_key(u)
-    if key in _SESSIONS:
-        return _SESSIONS[key]
-    s = requests.Session()
-    # 增加超时和重试机制，防止外部API卡死进程
-    from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
-    
-    retry_strategy = Retry(
-        total=3,  # 最多重试3次
-        backoff_factor=1,  # 重试间隔：1s, 2s, 4s
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(
-        pool_connections=50, 
-        pool_maxsize=50,
-        max_retries=retry_strategy
-    )
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
-    _SESSIONS[key] = s
+    with _SESSIONS_LOCK:
+        s = _SESSIONS.get(key)
+        if s is not None:
+            _SESSIONS.move_to_end(key)
+            return s
+        s = requests.Session()
+        # 源站证书经常不完整；在会话上统一关闭校验，单次调用仍可显式传 verify=True 覆盖
+        s.verify = False
+        s.mount("http://", _HTTP_ADAPTER)
+        s.mount("https://", _HTTPS_ADAPTER)
+        _SESSIONS[key] = s
+        # Evicted sessions are not closed: closing would tear down the shared adapters.
+        while len(_SESSIONS) > _MAX_SESSIONS:
+            _SESSIONS.popitem(last=False)
+    # A fresh session always needs its jar, even if the file was read for an evicted one.
+    _COOKIE_MTIME.pop(_cookie_file_path(u), None)
     load_cookies(u)
     return s
 
 
+def _cookie_sig(data: dict) -> bytes:
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _read_cookie_file(p: str, size: int):
+    with open(p, "rb") as f:
+        if size < _MMAP_MIN_BYTES or json_file.orjson is None:
+            return json_file.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mv = memoryview(mm)
+            try:
+                return json_file.orjson.loads(mv)
+            finally:
+                mv.release()
+
+
 def load_cookies(user: str | None = None) -> None:
     u = _get_user(user)
     if _is_guest_identity(u):
         return
     p = _cookie_file_path(u)
-    if not os.path.exists(p):
+    try:
+        st = os.stat(p)
+    except OSError:
+        return
+    mtime_ns = st.st_mtime_ns
+    if _COOKIE_MTIME.get(p) == mtime_ns:
         return
     s = get_session(u)
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_cookie_file(p, st.st_size)
         if isinstance(data, dict):
             s.cookies = cookiejar_from_dict(data)
+            _COOKIE_SIG[p] = _cookie_sig(data)
+            _COOKIE_MTIME[p] = mtime_ns
     except Exception:
         return
 
@@ -99,10 +148,15 @@ def save_cookies(user: str | None = None) -> None:
     s = get_session(u)
     p = _cookie_file_path(u)
     try:
-        os.makedirs(os.path.dirname(p), exist_ok=True)
         data = dict_from_cookiejar(s.cookies)
+        sig = _cookie_sig(data)
+        if _COOKIE_SIG.get(p) == sig and os.path.exists(p):
+            return
+        os.makedirs(os.path.dirname(p), exist_ok=True)
         with open(p, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False)
+        _COOKIE_SIG[p] = sig
+        _COOKIE_MTIME[p] = os.stat(p).st_mtime_ns
     except Exception:
         return
 
@@ -112,6 +166,8 @@ def clear_cookies(user: str | None = None) -> None:
     s = get_session(u)
     s.cookies.clear()
     p = _cookie_file_path(u)
+    _COOKIE_SIG.pop(p, None)
+    _COOKIE_MTIME.pop(p, None)
     try:
         if os.path.exists(p):
             os.remove(p)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from contextvars import ContextVar
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    import requests
 
-current_jm_identity: ContextVar[str | None] = ContextVar("current_jm_identity", default=None)
 
+current_jm_identity: ContextVar[str | None] = ContextVar("current_jm_identity", default=None)
+current_jm_session: ContextVar[requests.Session | None] = ContextVar("current_jm_session", default=None)
@@ -1,18 +1,43 @@
 from __future__ import annotations
 
-import json
+import atexit
+import contextlib
+import functools
 import os
-from typing import Any
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Iterator
 
+from backend.core.aura_sqlite import AuraDB, db_path_for, get_db
+from backend.core.json_file import atomic_write, dumps, loads
 from backend.core.paths import app_data_dir
 from backend.core.jm_context import current_jm_identity
 
 
+# Parsed store shared across calls; re-read only when the file's stat changes.
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": 0, "size": -1, "data": None}
+_LOCK = threading.RLock()
+
+# Mutations only mark the cache dirty; one write per debounce window persists them.
+_FLUSH_DELAY_SEC = 0.2
+_dirty = False
+_flush_timer: threading.Timer | None = None
+
+
+def _clean(s: Any) -> str:
+    if isinstance(s, str):
+        return s.strip()
+    return "" if s is None else str(s).strip()
+
+
+@functools.lru_cache(maxsize=1)
 def _default_store_path() -> str:
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     return os.path.join(base_dir, "backend", "config", "jm.json")
 
 
+@functools.lru_cache(maxsize=1)
 def get_store_path() -> str:
     if os.environ.get("JM_AURA_JM_STORE_PATH"):
         return os.environ["JM_AURA_JM_STORE_PATH"]
@@ -21,13 +46,17 @@ def get_store_path() -> str:
     return _default_store_path()
 
 
-def load_store() -> dict[str, Any]:
-    p = get_store_path()
-    if not os.path.exists(p):
-        return {"v": 1, "users": {}}
+def _stat_sig(p: str) -> tuple[int, int]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return 0, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(p: str) -> dict[str, Any]:
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            v = json.load(f)
+        v = loads(Path(p).read_bytes())
         if not isinstance(v, dict):
             return {"v": 1, "users": {}}
         if "users" not in v or not isinstance(v.get("users"), dict):
@@ -37,18 +66,74 @@ def load_store() -> dict[str, Any]:
         return {"v": 1, "users": {}}
 
 
+def load_store() -> dict[str, Any]:
+    # Returns the shared cached dict; callers mutate it in place under _LOCK and call _mark_dirty.
+    p = get_store_path()
+    with _LOCK:
+        if _dirty and _CACHE["data"] is not None:
+            return _CACHE["data"]
+        mtime_ns, size = _stat_sig(p)
+        if (
+            _CACHE["data"] is not None
+            and _CACHE["path"] == p
+            and _CACHE["mtime_ns"] == mtime_ns
+            and _CACHE["size"] == size
+        ):
+            return _CACHE["data"]
+        data = _read_file(p)
+        users = data["users"]
+        data["users"] = {sys.intern(k): v for k, v in users.items()}
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+        if _import_legacy(data):
+            _mark_dirty()
+        return data
+
+
 def save_store(data: dict[str, Any]) -> None:
     p = get_store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    with _LOCK:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        atomic_write(p, dumps(data))
+        mtime_ns, size = _stat_sig(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+
+
+def _mark_dirty() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        _dirty = True
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_DELAY_SEC, flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        t = _flush_timer
+        _flush_timer = None
+        if t is not None and t is not threading.current_thread():
+            t.cancel()
+        data = _CACHE["data"]
+        if not _dirty or data is None:
+            return
+        _dirty = False
+        try:
+            save_store(data)
+        except Exception:
+            _dirty = True
+            raise
+
+
+atexit.register(flush)
 
 
 def _user_key(user: str | None = None) -> str:
-    u = str(user or "").strip()
+    u = _clean(user)
     if not u:
-        u = str(current_jm_identity.get() or "").strip()
-    return u or "anon"
+        u = _clean(current_jm_identity.get())
+    return sys.intern(u) if u else "anon"
 
 
 def _get_user_bucket(d: dict[str, Any], user: str | None = None) -> dict[str, Any]:
@@ -64,103 +149,126 @@ def _get_user_bucket(d: dict[str, Any], user: str | None = None) -> dict[str, An
     return b
 
 
+def _peek_user_bucket(d: dict[str, Any], user: str | None = None) -> dict[str, Any]:
+    # Read-only counterpart of _get_user_bucket: never inserts into the shared cached dict.
+    users = d.get("users")
+    b = users.get(_user_key(user)) if isinstance(users, dict) else None
+    return b if isinstance(b, dict) else {}
+
+
+# Favorite ids live in SQLite next to the JSON file, which keeps user_id/profile.
+def _db() -> AuraDB:
+    return get_db(db_path_for(get_store_path()))
+
+
+def _import_legacy(d: dict[str, Any]) -> bool:
+    # Older files carry favorite_ids inline; move them into SQLite once.
+    rows = []
+    for key, b in d["users"].items():
+        if isinstance(b, dict):
+            v = b.get("favorite_ids")
+            if isinstance(v, list):
+                rows.extend((key, s) for s in map(_clean, v) if s)
+    if not rows:
+        return False
+    with _db().tx() as conn:
+        conn.executemany("INSERT OR IGNORE INTO favorites (user, album_id) VALUES (?, ?)", rows)
+    # Drop the inline lists only once SQLite holds them, so a failed import retries on next load.
+    for b in d["users"].values():
+        if isinstance(b, dict):
+            b.pop("favorite_ids", None)
+    return True
+
+
+@contextlib.contextmanager
+def transaction(user: str | None = None) -> Iterator[dict[str, Any]]:
+    # One load for a chain of edits; top-level key changes mark the store dirty once on exit.
+    with _LOCK:
+        b = _get_user_bucket(load_store(), user)
+        before = dict(b)
+        yield b
+        if b != before:
+            _mark_dirty()
+
+
 def set_user_id(user_id: str | None) -> None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    if user_id:
-        b["user_id"] = user_id
-    else:
-        b.pop("user_id", None)
-    save_store(d)
+    with transaction() as b:
+        if user_id:
+            b["user_id"] = user_id
+        else:
+            b.pop("user_id", None)
 
 
 def get_user_id() -> str | None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    v = b.get("user_id")
-    return v if isinstance(v, str) and v else None
+    with _LOCK:
+        v = _peek_user_bucket(load_store()).get("user_id")
+        return v if isinstance(v, str) and v else None
 
 
 def set_user_profile(raw: dict[str, Any]) -> None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    b["profile"] = raw
-    save_store(d)
+    with transaction() as b:
+        b["profile"] = raw
 
 
 def get_user_profile() -> dict[str, Any] | None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    v = b.get("profile")
-    return v if isinstance(v, dict) else None
+    with _LOCK:
+        v = _peek_user_bucket(load_store()).get("profile")
+        return v if isinstance(v, dict) else None
 
 
 def get_favorite_ids() -> set[str]:
-    d = load_store()
-    b = _get_user_bucket(d)
-    v = b.get("favorite_ids")
-    if isinstance(v, list):
-        out: set[str] = set()
-        for x in v:
-            s = str(x or "").strip()
-            if s:
-                out.add(s)
-        return out
-    return set()
+    load_store()  # imports legacy inline favorite_ids on first use
+    rows = _db().query("SELECT album_id FROM favorites WHERE user = ?", (_user_key(),))
+    return {aid for (aid,) in rows}
 
 
 def is_favorite(album_id: str) -> bool:
-    aid = str(album_id or "").strip()
+    aid = _clean(album_id)
     if not aid:
         return False
-    return aid in get_favorite_ids()
+    load_store()
+    rows = _db().query("SELECT 1 FROM favorites WHERE user = ? AND album_id = ?", (_user_key(), aid))
+    return bool(rows)
 
 
 def add_favorite_ids(album_ids: list[str]) -> None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    cur = get_favorite_ids()
-    for x in album_ids:
-        s = str(x or "").strip()
-        if s:
-            cur.add(s)
-    b["favorite_ids"] = sorted(cur)
-    save_store(d)
+    key = _user_key()
+    rows = [(key, s) for s in map(_clean, album_ids) if s]
+    with _db().tx() as conn:
+        conn.executemany("INSERT OR IGNORE INTO favorites (user, album_id) VALUES (?, ?)", rows)
 
 
 def set_favorite_ids(album_ids: list[str]) -> None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    out: set[str] = set()
-    for x in album_ids:
-        s = str(x or "").strip()
-        if s:
-            out.add(s)
-    b["favorite_ids"] = sorted(out)
-    save_store(d)
+    load_store()
+    key = _user_key()
+    rows = [(key, s) for s in set(map(_clean, album_ids)) if s]
+    with _db().tx() as conn:
+        conn.execute("DELETE FROM favorites WHERE user = ?", (key,))
+        conn.executemany("INSERT INTO favorites (user, album_id) VALUES (?, ?)", rows)
 
 
 def set_favorite(album_id: str, present: bool) -> None:
-    d = load_store()
-    b = _get_user_bucket(d)
-    cur = get_favorite_ids()
-    aid = str(album_id or "").strip()
+    aid = _clean(album_id)
     if not aid:
         return
+    load_store()
     if present:
-        cur.add(aid)
+        sql = "INSERT OR IGNORE INTO favorites (user, album_id) VALUES (?, ?)"
     else:
-        cur.discard(aid)
-    b["favorite_ids"] = sorted(cur)
-    save_store(d)
+        sql = "DELETE FROM favorites WHERE user = ? AND album_id = ?"
+    with _db().tx() as conn:
+        conn.execute(sql, (_user_key(), aid))
 
 
 def clear_current_user_data(user: str | None = None) -> None:
-    d = load_store()
-    users = d.get("users")
-    if not isinstance(users, dict):
-        return
-    key = _user_key(user)
-    if key in users:
-        users.pop(key, None)
-        save_store(d)
+    with _LOCK:
+        d = load_store()
+        users = d.get("users")
+        if not isinstance(users, dict):
+            return
+        key = _user_key(user)
+        with _db().tx() as conn:
+            conn.execute("DELETE FROM favorites WHERE user = ?", (key,))
+        if key in users:
+            users.pop(key, None)
+            _mark_dirty()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def atomic_write(path: str, data: str | bytes, *, fsync: bool = True, chmod: int | None = None) -> None:
+    tmp = path + ".tmp"
+    if isinstance(data, bytes):
+        f = open(tmp, "wb")
+    else:
+        f = open(tmp, "w", encoding="utf-8")
+    try:
+        with f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        if chmod is not None:
+            try:
+                os.chmod(tmp, chmod)
+            except Exception:
+                pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
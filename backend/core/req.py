@@ -1,20 +1,86 @@
+import base64
 import hashlib
+import threading
 import time
-import json
 import requests
 import urllib.parse
-from jmcomic import JmCryptoTool
+from collections import OrderedDict
+from jmcomic import JmCryptoTool, JmMagicConstants
 from backend.core.config import GlobalConfig
 from backend.core.http_session import get_session
+from backend.core.jm_context import current_jm_identity
+from backend.core.json_file import dumps, loads
 import platform
 from urllib.parse import urlparse, urlunparse
 
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except Exception:
+    Cipher = None
+
 _DOH_CACHE: dict[str, str] = {}
 _LAST_OK_API_BASE: str | None = None
 
+# Short-lived GET results keyed on (identity, url, query); values are serialized so every hit gets fresh objects.
+_RESP_CACHE: "OrderedDict[tuple, tuple[float, bytes]]" = OrderedDict()
+_RESP_CACHE_MAX = 128
+_RESP_CACHE_TTL_SEC = 5.0
+_RESP_CACHE_LOCK = threading.Lock()
+# Bumped by every write; a GET that started before the bump must not cache its result.
+_RESP_CACHE_GEN = 0
+
+_UA = "Mozilla/5.0 (Linux; Android 7.1.2; DT1901A Build/N2G47O; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/86.0.4240.198 Mobile Safari/537.36"
+_BASE_HEADERS = {"user-agent": _UA, "accept-encoding": "gzip", "connection": "keep-alive"}
+
+
+# salt -> {epoch second: md5 hex}; at most one digest per salt per wall-clock second.
+_TOKENS: dict[str, dict[int, str]] = {}
+_TOKENS_MAX = 4096
+
+
+def _token(now: int, salt: str) -> str:
+    by_now = _TOKENS.get(salt)
+    if by_now is None:
+        by_now = _TOKENS.setdefault(salt, {})
+    v = by_now.get(now)
+    if v is None:
+        v = hashlib.md5(f"{now}{salt}".encode("ascii"), usedforsecurity=False).hexdigest()
+        if len(by_now) >= _TOKENS_MAX:
+            by_now.clear()
+        by_now[now] = v
+    return v
+
+
+# (epoch second, header version, formatted "tokenparam"); swapped as one tuple so readers never see a mix.
+_TICK: tuple[int, str, str] = (0, "", "")
+
+
+def _now_cached(ver: str) -> tuple[int, str, str]:
+    global _TICK
+    now = int(time.time())
+    tick = _TICK
+    if tick[0] != now or tick[1] != ver:
+        tick = (now, ver, f"{now},{ver}")
+        _TICK = tick
+    return tick
+
+
+def _decode_resp_data(data: str, ts: int) -> str:
+    # Same scheme as JmCryptoTool.decode_resp_data (base64 -> AES-ECB keyed on md5(ts + secret) -> strip padding),
+    # but the key comes from the per-second _token cache and OpenSSL does the AES.
+    if Cipher is None:
+        return JmCryptoTool.decode_resp_data(data, ts=ts)
+    try:
+        key = _token(ts, JmMagicConstants.APP_DATA_SECRET).encode("ascii")
+        dec = Cipher(algorithms.AES(key), modes.ECB()).decryptor()
+        pt = dec.update(base64.b64decode(data)) + dec.finalize()
+        return pt[:-pt[-1]].decode("utf-8")
+    except Exception:
+        return JmCryptoTool.decode_resp_data(data, ts=ts)
+
 
 def get_last_ok_api_base() -> str | None:
     return _LAST_OK_API_BASE
@@ -35,28 +101,38 @@ def get_current_img_base() -> str:
     except Exception:
         return ""
 
+
+def _invalidate_resp_cache() -> None:
+    global _RESP_CACHE_GEN
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE_GEN += 1
+        _RESP_CACHE.clear()
+
+
 class ServerReq(object):
-    def __init__(self, url, params=None, method="POST") -> None:
+    # Many short-lived instances per page; subclasses declare their own extra fields.
+    __slots__ = ("url", "query_params", "params", "method", "timeout", "proxy", "cookies", "now", "tokenparam", "headers", "no_cache")
+
+    def __init__(self, url, params=None, method="POST", query_params=None) -> None:
         self.url = url
-        self.params = params or {}
+        # GET query dict; requests encodes it onto whichever API base the attempt uses.
+        self.query_params = query_params or {}
+        # DictToUrl output is already percent-encoded ASCII; hand requests bytes so it sends the body as-is.
+        self.params = params.encode("ascii") if isinstance(params, str) else (params or {})
         self.method = method
         self.timeout = 10
         self.proxy = None
         self.cookies = {}
-        self.now = int(time.time())
+        # Set on reads that poll for a write to show up; they must reach the server every time.
+        self.no_cache = False
+        self.now, _, self.tokenparam = _now_cached(GlobalConfig.HeaderVer.value)
         self.headers = self.GetHeader(url, method)
         
     def GetHeader(self, _url: str, method: str) -> dict:
-        param = "{}{}".format(self.now, "18comicAPP")
-        token = hashlib.md5(param.encode("utf-8")).hexdigest()
-        
-        ua = "Mozilla/5.0 (Linux; Android 7.1.2; DT1901A Build/N2G47O; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/86.0.4240.198 Mobile Safari/537.36"
-
         header = {
-            "tokenparam": "{},{}".format(self.now, GlobalConfig.HeaderVer.value),
-            "token": token,
-            "user-agent": ua,
-            "accept-encoding": "gzip",
+            "tokenparam": self.tokenparam,
+            "token": _token(self.now, "18comicAPP"),
+            **_BASE_HEADERS,
             "version": GlobalConfig.AppVersion.value,
         }
         if method == "POST":
@@ -64,21 +140,17 @@ class ServerReq(object):
         return header
 
     def GetHeader2(self, _url: str, method: str) -> dict:
-        param = "{}{}".format(self.now, "18comicAPPContent")
-        token = hashlib.md5(param.encode("utf-8")).hexdigest()
-
         header = {
-            "tokenparam": "{},{}".format(self.now, GlobalConfig.HeaderVer.value),
-            "token": token,
-            "user-agent": "Mozilla/5.0 (Linux; Android 7.1.2; DT1901A Build/N2G47O; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/86.0.4240.198 Mobile Safari/537.36",
-            "accept-encoding": "gzip",
+            "tokenparam": self.tokenparam,
+            "token": _token(self.now, "18comicAPPContent"),
+            **_BASE_HEADERS,
         }
         if method == "POST":
             header["Content-Type"] = "application/x-www-form-urlencoded"
         return header
 
     def ParseData(self, data) -> str:
-        return JmCryptoTool.decode_resp_data(data, ts=self.now)
+        return _decode_resp_data(data, self.now)
 
     def _candidate_api_bases(self) -> list[str]:
         bases: list[str] = []
@@ -151,6 +223,42 @@ class ServerReq(object):
         return any(x in msg for x in ("name resolution", "nodename nor servname", "getaddrinfo failed", "temporary failure in name resolution"))
 
     def execute(self):
+        if self.method != "GET":
+            # Writes (favorites, comments, login) can change what the cached GETs would return.
+            # Invalidate on both sides so GETs overlapping the write never cache their result.
+            _invalidate_resp_cache()
+            try:
+                return self._send()
+            finally:
+                _invalidate_resp_cache()
+        if self.no_cache:
+            return self._send()
+        key = (current_jm_identity.get(), self.url, tuple(sorted(self.query_params.items())))
+        now = time.monotonic()
+        with _RESP_CACHE_LOCK:
+            hit = _RESP_CACHE.get(key)
+            if hit is not None:
+                if now - hit[0] < _RESP_CACHE_TTL_SEC:
+                    _RESP_CACHE.move_to_end(key)
+                    return loads(hit[1])
+                del _RESP_CACHE[key]
+            gen = _RESP_CACHE_GEN
+        result = self._send()
+        if isinstance(result, (dict, list)):
+            try:
+                payload = dumps(result)
+            except Exception:
+                return result
+            with _RESP_CACHE_LOCK:
+                if gen != _RESP_CACHE_GEN:
+                    return result
+                _RESP_CACHE[key] = (now, payload)
+                _RESP_CACHE.move_to_end(key)
+                while len(_RESP_CACHE) > _RESP_CACHE_MAX:
+                    _RESP_CACHE.popitem(last=False)
+        return result
+
+    def _send(self):
         session = get_session()
         bases = self._candidate_api_bases()
         base_matched = any(isinstance(b, str) and b and self.url.startswith(b) for b in bases)
@@ -166,18 +274,19 @@ class ServerReq(object):
             kwargs = {
                 "headers": self.headers,
                 "timeout": self.timeout,
-                "cookies": self.cookies,
-                "verify": False,
             }
 
+            if self.method != "GET":
+                kwargs["data"] = self.params
+            if self.query_params:
+                kwargs["params"] = self.query_params
+            if self.cookies:
+                kwargs["cookies"] = self.cookies
             if self.proxy:
                 kwargs["proxies"] = self.proxy
 
             try:
-                if self.method == "GET":
-                    response = session.get(url, **kwargs)
-                else:
-                    response = session.post(url, data=self.params, **kwargs)
+                response = session.request(self.method, url, **kwargs)
             except Exception as e:
                 last_exc = e
                 if self._should_try_doh(e):
@@ -190,10 +299,7 @@ class ServerReq(object):
                             new_headers["Host"] = host
                             kwargs["headers"] = new_headers
                             ip_url = urlunparse((u.scheme, ip, u.path, u.params, u.query, u.fragment))
-                            if self.method == "GET":
-                                response = session.get(ip_url, **kwargs)
-                            else:
-                                response = session.post(ip_url, data=self.params, **kwargs)
+                            response = session.request(self.method, ip_url, **kwargs)
                         else:
                             continue
                     except Exception as e2:
@@ -213,9 +319,12 @@ class ServerReq(object):
                 return response.text
 
             try:
-                resp_json = response.json()
+                resp_json = loads(response.content)
             except Exception:
-                return response.text
+                try:
+                    resp_json = response.json()
+                except Exception:
+                    return response.text
 
             if isinstance(resp_json, dict) and "code" in resp_json:
                 if resp_json.get("code") != 200:
@@ -229,7 +338,7 @@ class ServerReq(object):
                 try:
                     if base_matched:
                         self._record_last_ok_api_base(url, bases)
-                    return json.loads(decoded_str)
+                    return loads(decoded_str)
                 except Exception:
                     if base_matched:
                         self._record_last_ok_api_base(url, bases)
@@ -243,81 +352,108 @@ class ServerReq(object):
             raise last_exc
         raise Exception("Request failed")
 
+# Fixed-shape GET endpoints: only the values change, so keys are pre-encoded in the template.
+_INDEX_TMPL = "{base}/promote/?page={page}"
+_LATEST_TMPL = "{base}/latest/?page={page}"
+_ALBUM_TMPL = "{base}/album/?comicName=&id={id}"
+_CHAPTER_TMPL = "{base}/chapter/?comicName=&skip=&id={id}"
+_CHAPTER_VIEW_TMPL = "{base}/chapter_view_template/?id={id}&mode=vertical&page=0&app_img_shunt=NaN"
+_FAVORITE_TMPL = "{base}/favorite/?page={page}&folder_id={fid}&o={o}"
+_MY_COMMENT_TMPL = "{base}/forum/?mode=undefined&uid={uid}&page={page}"
+
+_API_BASE: tuple[tuple, str] = ((), "")
+
+
+def _api_base() -> str:
+    # Re-resolved only when the API selection settings change.
+    global _API_BASE
+    key = (
+        GlobalConfig.ProxySelectIndex,
+        GlobalConfig.HostApiDomain,
+        tuple(GlobalConfig.Url2List.value or ()),
+        GlobalConfig.CdnApiUrl.value,
+        GlobalConfig.ProxyApiUrl.value,
+    )
+    cached = _API_BASE
+    if cached[0] != key:
+        cached = (key, GlobalConfig.GetApiUrl())
+        _API_BASE = cached
+    return cached[1]
+
+
+def _q(v) -> str:
+    return urllib.parse.quote(str(v))
+
+
 class ToolUtil:
     @staticmethod
     def DictToUrl(data):
         if not isinstance(data, dict):
             return ""
-        parts = []
-        for k, v in data.items():
-            parts.append(f"{urllib.parse.quote(str(k))}={urllib.parse.quote(str(v))}")
-        return "&".join(parts)
+        # safe="/" keeps the output identical to quote()'s default per key/value.
+        return urllib.parse.urlencode(data, safe="/", quote_via=urllib.parse.quote)
 
 # 获得首页
 class GetIndexInfoReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, page="0"):
-        url = GlobalConfig.GetApiUrl() + "/promote"
+        url = _INDEX_TMPL.format(base=_api_base(), page=_q(page))
         method = "GET"
-        data = dict()
-        data["page"] = page
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 获得最近更新
 class GetLatestInfoReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, page="0"):
-        url = GlobalConfig.GetApiUrl() + "/latest"
+        url = _LATEST_TMPL.format(base=_api_base(), page=_q(page))
         method = "GET"
-        data = dict()
-        data["page"] = page
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 检查更新
 class CheckUpdateReq(ServerReq):
+    __slots__ = ()
+
     def __init__(self, url2, isPre=False):
         method = "GET"
         data = dict()
         data["version"] = GlobalConfig.HeaderVer.value
         data["platform"] = platform.platform()
         if not isPre:
-            url = url2 + "/version.txt?"
+            url = url2 + "/version.txt"
         else:
-            url = url2 + "/version_pre.txt?"
-        url += ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+            url = url2 + "/version_pre.txt"
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 检查更新配置
 class CheckUpdateConfigReq(ServerReq):
+    __slots__ = ()
+
     def __init__(self, url2):
         method = "GET"
         data = dict()
         data["version"] = GlobalConfig.HeaderVer.value
         data["platform"] = platform.platform()
-        url = url2 + "/config.txt?"
-        url += ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+        url = url2 + "/config.txt"
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 登陆
 class LoginReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, userId, passwd):
         method = "POST"
-        url = GlobalConfig.GetApiUrl() + "/login"
+        url = _api_base() + "/login"
         data = dict()
         data["username"] = userId
         data["password"] = passwd
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 注册
 class RegisterReq(ServerReq):
+    __slots__ = ()
+
     def __init__(self, userId, email, passwd, passwd2, sex="Male",  ver=""):
         # [Male, Female]
 
@@ -335,61 +471,45 @@ class RegisterReq(ServerReq):
         data["age"] = "on"
         data["terms"] = "on"
         data["submit_signup"] = ""
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
         # self.headers = self.GetWebHeader() # We might need web headers for this
 
 # 本子信息
 class GetBookInfoReq2(ServerReq):
+    __slots__ = ("bookId",)
+
     def __init__(self, bookId):
         self.bookId = bookId
-        url = GlobalConfig.GetApiUrl() + "/album"
+        url = _ALBUM_TMPL.format(base=_api_base(), id=_q(bookId))
         method = "GET"
-        data = dict()
-        data["comicName"] = ""
-        data["id"] = bookId
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 获得scramble_id
 class GetBookEpsScrambleReq2(ServerReq):
+    __slots__ = ("bookId", "epsIndex")
+
     def __init__(self, bookId, epsIndex, epsId):
         self.bookId = bookId
         self.epsIndex = epsIndex
-        url = GlobalConfig.GetApiUrl() + "/chapter_view_template"
+        url = _CHAPTER_VIEW_TMPL.format(base=_api_base(), id=_q(epsId))
         method = "GET"
-        data = dict()
-        data["id"] = epsId
-        data["mode"] = "vertical"
-        data["page"] = "0"
-        data["app_img_shunt"] = "NaN"
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
         self.headers = self.GetHeader2(url, method)
 
 # 章节信息
 class GetBookEpsInfoReq2(ServerReq):
+    __slots__ = ("bookId",)
+
     def __init__(self, bookId, epsId):
         self.bookId = bookId
-        url = GlobalConfig.GetApiUrl() + "/chapter"
+        url = _CHAPTER_TMPL.format(base=_api_base(), id=_q(epsId))
         method = "GET"
-        data = dict()
-        data["comicName"] = ""
-        data["skip"] = ""
-        data["id"] = epsId
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 搜索请求
 class GetSearchReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, search, sort="mr", page=1):
         # 最新，最多点击，最多图片, 最多爱心
         # o = [mr, mv, mp, tf]
@@ -400,27 +520,23 @@ class GetSearchReq2(ServerReq):
             data['page'] = str(page)
         if sort:
             data["o"] = sort
-        url = GlobalConfig.GetApiUrl() + "/search"
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
+        url = _api_base() + "/search/"
         method = "GET"
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 分類请求
 class GetCategoryReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self):
-        url = GlobalConfig.GetApiUrl() + "/categories"
-        data = dict()
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
+        url = _api_base() + "/categories"
         method = "GET"
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 分類搜索请求
 class GetSearchCategoryReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, category="0", page=1, sort="mr", tag: str | None = None):
         # sort []&t=t&o=tf
         # 最新，总排行，月排行，周排行， 日排行，最多图片, 最多爱心
@@ -428,7 +544,7 @@ class GetSearchCategoryReq2(ServerReq):
         # 最新, 同人, 单本, 短篇， 其他，韩漫， 美漫， CosPlay， 3D
         # category = ["0", "doujin", "single", "short", "another", "hanman", "meiman", "doujin_cosplay", "3D"]
 
-        url = GlobalConfig.GetApiUrl() + "/categories/filter"
+        url = _api_base() + "/categories/filter"
 
         data = dict()
 
@@ -442,223 +558,228 @@ class GetSearchCategoryReq2(ServerReq):
         if tag:
             data["t"] = str(tag)
 
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
+        if data:
+            url += "/"
         method = "GET"
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 获得收藏
 class GetFavoritesReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, page=1, sort="mr", fid=""):
         # 收藏时间, 更新时间
         # o = [mr, mp]
-        url = GlobalConfig.GetApiUrl() + "/favorite"
+        url = _FAVORITE_TMPL.format(base=_api_base(), page=_q(page), fid=_q(fid or "0"), o=_q(sort))
         method = "GET"
-        data = dict()
-        data["page"] = page
-        if fid:
-            data["folder_id"] = fid
-        else:
-            data["folder_id"] = "0"
-        data["o"] = sort
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 添加收藏文件夹
 class AddFavoritesFoldReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, name=""):
-        url = GlobalConfig.GetApiUrl() + "/favorite_folder"
+        url = _api_base() + "/favorite_folder"
         method = "POST"
         data = dict()
         data["folder_name"] = name
         data["type"] = "add"
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 删除收藏文件夹
 class DelFavoritesFoldReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, fid=""):
-        url = GlobalConfig.GetApiUrl() + "/favorite_folder"
+        url = _api_base() + "/favorite_folder"
         method = "POST"
         data = dict()
         data["folder_id"] = fid
         data["type"] = "del"
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 重命名收藏文件夹
 class RenameFavoritesFoldReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, fid="", name="", rename_type="rename"):
-        url = GlobalConfig.GetApiUrl() + "/favorite_folder"
+        url = _api_base() + "/favorite_folder"
         method = "POST"
         data = dict()
         data["folder_id"] = fid
         data["folder_name"] = name
         data["type"] = rename_type
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 移动收藏文件夹
 class MoveFavoritesFoldReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, bookId="", fid=""):
-        url = GlobalConfig.GetApiUrl() + "/favorite_folder"
+        url = _api_base() + "/favorite_folder"
         method = "POST"
         data = dict()
         data["folder_id"] = fid
         data["type"] = "move"
         data["aid"] = bookId
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 添加收藏
 class AddAndDelFavoritesReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, bookId=""):
-        url = GlobalConfig.GetApiUrl() + "/favorite"
+        url = _api_base() + "/favorite"
         method = "POST"
         data = dict()
         data["aid"] = bookId
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 获得评论
 class GetCommentReq2(ServerReq):
+    __slots__ = ("bookId",)
+
     def __init__(self, bookId="", page="1", readMode="manhua"):
         self.bookId = bookId
-        url = GlobalConfig.GetApiUrl() + "/forum"
+        url = _api_base() + "/forum"
         method = "GET"
         data = dict()
         data["mode"] = readMode
         if bookId:
             data["aid"] = bookId
         data["page"] = page
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url + "/", {}, method, data)
 
 # 获得评论
 class GetMyCommentReq2(ServerReq):
+    __slots__ = ("uid",)
+
     def __init__(self, uid, page="1"):
         self.uid = uid
-        url = GlobalConfig.GetApiUrl() + "/forum"
+        url = _MY_COMMENT_TMPL.format(base=_api_base(), uid=_q(uid), page=_q(page))
         method = "GET"
-        data = dict()
-        data["mode"] = "undefined"
-        data["uid"] = uid
-        data["page"] = page
-
-        param = ToolUtil.DictToUrl(data)
-        if param:
-            url += "/?" + param
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method)
 
 # 发送评论
 class SendCommentReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, bookId="", comment="", cid=""):
-        url = GlobalConfig.GetApiUrl() + "/comment"
+        url = _api_base() + "/comment"
         method = "POST"
         data = dict()
         data["comment"] = comment
         data["aid"] = bookId
         if cid:
             data["comment_id"] = cid
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 评论点赞
 class LikeCommentReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, cid=""):
-        url = GlobalConfig.GetApiUrl() + "/comment/like"
+        url = _api_base() + "/comment/like"
         method = "POST"
         data = {"cid": cid}
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 获取观看记录
 class GetHistoryReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, page=1):
-        url = GlobalConfig.GetApiUrl() + "/watch_list"
+        url = _api_base() + "/watch_list"
         method = "GET"
-        data = dict()
-        data["page"] = page
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, {}, method, query_params={"page": page})
 
 # Jcoin购买
 class GetBuyComicsReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, bookId=""):
-        url = GlobalConfig.GetApiUrl() + "/coin_buy_comics"
+        url = _api_base() + "/coin_buy_comics"
         method = "POST"
         data = dict()
         data["id"] = bookId
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
 
 # 获取周推荐分类
 class GetWeekCategoriesReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, page=0):
-        url = GlobalConfig.GetApiUrl() + "/week"
+        url = _api_base() + "/week"
         method = "GET"
-        data = dict()
-        data["page"] = page
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, {}, method, query_params={"page": page})
 
 # 获取周推荐
 class GetWeekFilterReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, id, type, page=0):
-        url = GlobalConfig.GetApiUrl() + "/week/filter?"
+        url = _api_base() + "/week/filter"
         method = "GET"
         data = dict()
         data["page"] = page
         data["id"] = id
         data["type"] = type
-        url = url + ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 获取深夜食堂
 class GetBlogsReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, blog_type="dinner", search_query="", page=1):
-        url = GlobalConfig.GetApiUrl() + "/blogs?"
+        url = _api_base() + "/blogs"
         method = "GET"
         data = dict()
         data["blog_type"] = blog_type
         data["page"] = page
         data["search_query"] = search_query
-        url = url + ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 获取深夜食堂
 class GetBlogInfoReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, id):
-        url = GlobalConfig.GetApiUrl() + "/blog?"
+        url = _api_base() + "/blog"
         method = "GET"
         data = dict()
         data["id"] = id
-        url = url + ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 获取深夜食堂
 class GetBlogForumReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, bid, page=1, mode="blog"):
-        url = GlobalConfig.GetApiUrl() + "/forum?"
+        url = _api_base() + "/forum"
         method = "GET"
         data = dict()
         data["bid"] = bid
         data["page"] = page
         data["mode"] = mode
-        url = url + ToolUtil.DictToUrl(data)
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, data)
 
 # 获取签到信息
 class GetDailyReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, user_id):
-        url = GlobalConfig.GetApiUrl() + "/daily?user_id=" + user_id
+        url = _api_base() + "/daily"
         method = "GET"
-        super(self.__class__, self).__init__(url, {}, method)
+        ServerReq.__init__(self, url, {}, method, {"user_id": user_id})
 
 # 签到
 class SignDailyReq2(ServerReq):
+    __slots__ = ()
+
     def __init__(self, user_id, daily_id):
-        url = GlobalConfig.GetApiUrl() + "/daily_chk"
+        url = _api_base() + "/daily_chk"
         method = "POST"
         data = dict()
         data["user_id"] = user_id
         data["daily_id"] = daily_id
-        super(self.__class__, self).__init__(url, ToolUtil.DictToUrl(data), method)
+        ServerReq.__init__(self, url, ToolUtil.DictToUrl(data), method)
@@ -1,20 +1,82 @@
 from __future__ import annotations
 
-import base64
-import json
+import binascii
+import contextlib
+import functools
+import hashlib
 import os
 import sys
+import threading
+from pathlib import Path
 from typing import Any
 
+from backend.core.json_file import atomic_write, dumps, loads
 from backend.core.paths import app_data_dir
 from backend.core.site_auth import current_site_user
 
 
+_IS_WIN = sys.platform.startswith("win")
+
+if _IS_WIN:
+    import ctypes
+    import ctypes.wintypes
+
+    class _DATA_BLOB(ctypes.Structure):
+        _fields_ = [("cbData", ctypes.wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_byte))]
+
+    # Private DLL handles so the prototypes below don't leak into ctypes.windll users.
+    _crypt32 = ctypes.WinDLL("crypt32")
+    _kernel32 = ctypes.WinDLL("kernel32")
+    _PBLOB = ctypes.POINTER(_DATA_BLOB)
+    _DPAPI_ARGTYPES = [
+        _PBLOB,
+        ctypes.wintypes.LPCWSTR,
+        _PBLOB,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.wintypes.DWORD,
+        _PBLOB,
+    ]
+    _CryptProtectData = _crypt32.CryptProtectData
+    _CryptProtectData.argtypes = _DPAPI_ARGTYPES
+    _CryptProtectData.restype = ctypes.wintypes.BOOL
+    _CryptUnprotectData = _crypt32.CryptUnprotectData
+    _CryptUnprotectData.argtypes = _DPAPI_ARGTYPES
+    _CryptUnprotectData.restype = ctypes.wintypes.BOOL
+    _LocalFree = _kernel32.LocalFree
+    _LocalFree.argtypes = [ctypes.c_void_p]
+    _LocalFree.restype = ctypes.c_void_p
+
+# keyring module once imported; False when it is not installed.
+_KEYRING: Any = None
+
+# Parsed store shared across calls; re-read only when the file's stat changes.
+# "sig" is the digest of the last bytes we wrote, so unchanged saves can skip the disk.
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": 0, "size": -1, "data": None, "sig": None}
+_LOCK = threading.RLock()
+
+# Bumped whenever the cached store is replaced or saved; list_accounts results are keyed on it.
+_GEN = 0
+_ACCOUNTS_MEMO: dict[str, tuple[int, str, tuple[tuple[str, bool], ...]]] = {}
+
+
 def _keyring_disabled() -> bool:
     v = str(os.environ.get("JM_AURA_DISABLE_KEYRING") or "").strip().lower()
     return v in {"1", "true", "yes", "on"}
 
 
+def _keyring() -> Any:
+    global _KEYRING
+    if _KEYRING is None:
+        try:
+            import keyring  # type: ignore
+            _KEYRING = keyring
+        except Exception:
+            _KEYRING = False
+    return _KEYRING or None
+
+
+@functools.lru_cache(maxsize=1)
 def _store_path() -> str:
     if os.environ.get("JM_AURA_CREDENTIALS_PATH"):
         return os.environ["JM_AURA_CREDENTIALS_PATH"]
@@ -24,13 +86,19 @@ def _store_path() -> str:
     return os.path.join(base_dir, "backend", "config", "credentials.json")
 
 
-def _load_raw() -> dict[str, Any]:
-    p = _store_path()
+def _stat_sig(p: str) -> tuple[int, int]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return 0, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(p: str) -> dict[str, Any]:
     if not os.path.exists(p):
         return {"v": 2, "users": {}}
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            v = json.load(f)
+        v = loads(Path(p).read_bytes())
         if not isinstance(v, dict):
             return {"v": 2, "users": {}}
         if "users" not in v or not isinstance(v.get("users"), dict):
@@ -42,15 +110,48 @@ def _load_raw() -> dict[str, Any]:
         return {"v": 2, "users": {}}
 
 
+def _load_raw() -> dict[str, Any]:
+    # Returns the shared cached dict; mutators edit it in place under _LOCK and then call _save_raw.
+    p = _store_path()
+    with _LOCK:
+        mtime_ns, size = _stat_sig(p)
+        if (
+            _CACHE["data"] is not None
+            and _CACHE["path"] == p
+            and _CACHE["mtime_ns"] == mtime_ns
+            and _CACHE["size"] == size
+        ):
+            return _CACHE["data"]
+        data = _read_file(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data, sig=None)
+        _bump_gen()
+        return data
+
+
+def _bump_gen() -> None:
+    global _GEN
+    _GEN += 1
+    _ACCOUNTS_MEMO.clear()
+
+
 def _save_raw(data: dict[str, Any]) -> None:
     p = _store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    try:
-        os.chmod(p, 0o600)
-    except Exception:
-        pass
+    with _LOCK:
+        payload = dumps(data)
+        sig = hashlib.blake2b(payload, digest_size=16).digest()
+        if (
+            _CACHE["sig"] == sig
+            and _CACHE["path"] == p
+            and (_CACHE["mtime_ns"], _CACHE["size"]) == _stat_sig(p)
+        ):
+            _CACHE["data"] = data
+            _bump_gen()
+            return
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        atomic_write(p, payload, chmod=0o600)
+        mtime_ns, size = _stat_sig(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data, sig=sig)
+        _bump_gen()
 
 
 def _site_user(user: str | None = None) -> str:
@@ -98,6 +199,16 @@ def _migrate_to_v2(raw: dict[str, Any]) -> dict[str, Any]:
     return {"v": 2, "users": out_users}
 
 
+def _peek_accounts(data: dict[str, Any], user: str | None = None) -> tuple[dict[str, Any], str]:
+    # Read-only counterpart of _bucket + _accounts_bucket: never inserts into the shared cached dict.
+    users = data.get("users")
+    b = users.get(_site_user(user)) if isinstance(users, dict) else None
+    if not isinstance(b, dict):
+        return {}, ""
+    acc = b.get("accounts")
+    return (acc if isinstance(acc, dict) else {}), str(b.get("active") or "").strip()
+
+
 def _accounts_bucket(b: dict[str, Any]) -> tuple[dict[str, Any], str]:
     acc = b.get("accounts")
     if not isinstance(acc, dict):
@@ -108,104 +219,91 @@ def _accounts_bucket(b: dict[str, Any]) -> tuple[dict[str, Any], str]:
 
 
 def list_accounts(*, user: str | None = None) -> dict[str, Any]:
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, active = _accounts_bucket(b)
-    out = []
-    for k in sorted(acc.keys()):
-        u = str(k or "").strip()
-        if not u:
-            continue
-        rec = acc.get(u)
-        has_pw = False
-        if isinstance(rec, dict):
-            if sys.platform.startswith("win"):
-                has_pw = bool(str(rec.get("password_dpapi_b64") or "").strip())
-            else:
-                has_pw = bool(rec.get("password_keyring") is True or str(rec.get("password_plain") or "").strip())
-        out.append({"username": u, "active": (u == active), "has_password": has_pw})
-    return {"active": active, "accounts": out}
+    # UIs poll this; the sorted listing is only rebuilt after the store changes.
+    with _LOCK:
+        raw = _load_raw()
+        site_u = _site_user(user)
+        hit = _ACCOUNTS_MEMO.get(site_u)
+        if hit is not None and hit[0] == _GEN:
+            _, active, rows = hit
+        else:
+            acc, active = _peek_accounts(raw, user=user)
+            out = []
+            for k in sorted(acc.keys()):
+                u = str(k or "").strip()
+                if not u:
+                    continue
+                rec = acc.get(u)
+                has_pw = False
+                if isinstance(rec, dict):
+                    if _IS_WIN:
+                        has_pw = bool(str(rec.get("password_dpapi_b64") or "").strip())
+                    else:
+                        has_pw = bool(rec.get("password_keyring") is True or str(rec.get("password_plain") or "").strip())
+                out.append((u, has_pw))
+            rows = tuple(out)
+            _ACCOUNTS_MEMO[site_u] = (_GEN, active, rows)
+    return {"active": active, "accounts": [{"username": u, "active": (u == active), "has_password": pw} for u, pw in rows]}
 
 
 def set_active(username: str, *, user: str | None = None) -> None:
     u = str(username or "").strip()
     if not u:
         raise ValueError("Missing username")
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, _ = _accounts_bucket(b)
-    if u not in acc:
-        raise ValueError("Account not found")
-    b["active"] = u
-    _save_raw(raw)
+    with _LOCK:
+        raw = _load_raw()
+        acc, _ = _peek_accounts(raw, user=user)
+        if u not in acc:
+            raise ValueError("Account not found")
+        _bucket(raw, user=user)["active"] = u
+        _save_raw(raw)
 
 
 def remove_account(username: str, *, user: str | None = None) -> None:
     u = str(username or "").strip()
     if not u:
         raise ValueError("Missing username")
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, active = _accounts_bucket(b)
-    rec = acc.get(u)
-    if isinstance(rec, dict):
-        if rec.get("password_keyring") is True and not sys.platform.startswith("win"):
-            if not _keyring_disabled():
-                try:
-                    import keyring  # type: ignore
+    with _LOCK:
+        raw = _load_raw()
+        acc, active = _peek_accounts(raw, user=user)
+        if u not in acc and active != u:
+            return
+        b = _bucket(raw, user=user)
+        acc, active = _accounts_bucket(b)
+        rec = acc.get(u)
+        if isinstance(rec, dict):
+            if rec.get("password_keyring") is True and not _IS_WIN:
+                keyring = None if _keyring_disabled() else _keyring()
+                if keyring is not None:
                     try:
                         site_u = _site_user(user)
                         keyring.delete_password("JM-Aura", f"{site_u}:{u}")
                     except Exception:
                         pass
-                except Exception:
-                    pass
-    acc.pop(u, None)
-    if active == u:
-        b["active"] = next(iter(sorted(acc.keys())), "")
-    _save_raw(raw)
-
-
-def _dpapi_encrypt(plain: bytes) -> bytes:
-    import ctypes
-    import ctypes.wintypes
-
-    class DATA_BLOB(ctypes.Structure):
-        _fields_ = [("cbData", ctypes.wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_byte))]
-
-    crypt32 = ctypes.windll.crypt32
-    kernel32 = ctypes.windll.kernel32
-
-    in_blob = DATA_BLOB(len(plain), ctypes.cast(ctypes.create_string_buffer(plain), ctypes.POINTER(ctypes.c_byte)))
-    out_blob = DATA_BLOB()
-    if not crypt32.CryptProtectData(ctypes.byref(in_blob), None, None, None, None, 0, ctypes.byref(out_blob)):
-        raise OSError("CryptProtectData failed")
+        acc.pop(u, None)
+        if active == u:
+            b["active"] = next(iter(sorted(acc.keys())), "")
+        _save_raw(raw)
+
+
+def _dpapi_call(fn: Any, data: bytes, name: str) -> bytes:
+    buf = ctypes.create_string_buffer(data, len(data))
+    in_blob = _DATA_BLOB(len(data), ctypes.cast(buf, ctypes.POINTER(ctypes.c_byte)))
+    out_blob = _DATA_BLOB()
+    if not fn(ctypes.byref(in_blob), None, None, None, None, 0, ctypes.byref(out_blob)):
+        raise OSError(f"{name} failed")
     try:
-        out = ctypes.string_at(out_blob.pbData, out_blob.cbData)
+        return ctypes.string_at(out_blob.pbData, out_blob.cbData)
     finally:
-        kernel32.LocalFree(out_blob.pbData)
-    return out
+        _LocalFree(out_blob.pbData)
 
 
-def _dpapi_decrypt(cipher: bytes) -> bytes:
-    import ctypes
-    import ctypes.wintypes
-
-    class DATA_BLOB(ctypes.Structure):
-        _fields_ = [("cbData", ctypes.wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_byte))]
+def _dpapi_encrypt(plain: bytes) -> bytes:
+    return _dpapi_call(_CryptProtectData, plain, "CryptProtectData")
 
-    crypt32 = ctypes.windll.crypt32
-    kernel32 = ctypes.windll.kernel32
 
-    in_blob = DATA_BLOB(len(cipher), ctypes.cast(ctypes.create_string_buffer(cipher), ctypes.POINTER(ctypes.c_byte)))
-    out_blob = DATA_BLOB()
-    if not crypt32.CryptUnprotectData(ctypes.byref(in_blob), None, None, None, None, 0, ctypes.byref(out_blob)):
-        raise OSError("CryptUnprotectData failed")
-    try:
-        out = ctypes.string_at(out_blob.pbData, out_blob.cbData)
-    finally:
-        kernel32.LocalFree(out_blob.pbData)
-    return out
+def _dpapi_decrypt(cipher: bytes) -> bytes:
+    return _dpapi_call(_CryptUnprotectData, cipher, "CryptUnprotectData")
 
 
 def set_credentials(jm_username: str, jm_password: str, *, user: str | None = None) -> None:
@@ -214,75 +312,100 @@ def set_credentials(jm_username: str, jm_password: str, *, user: str | None = No
     if not u or not p:
         raise ValueError("Missing username or password")
 
-    raw = _load_raw()
-    raw["v"] = 2
-    b = _bucket(raw, user=user)
-    acc, _ = _accounts_bucket(b)
-    rec = acc.get(u)
-    if not isinstance(rec, dict):
-        rec = {}
-        acc[u] = rec
-
-    if sys.platform.startswith("win"):
-        enc = _dpapi_encrypt(p.encode("utf-8"))
-        rec["password_dpapi_b64"] = base64.b64encode(enc).decode("ascii")
-        rec.pop("password_plain", None)
-        rec.pop("password_keyring", None)
-    else:
-        site_u = _site_user(user)
-        if _keyring_disabled():
-            rec["password_plain"] = p
-            rec["password_keyring"] = False
+    with _LOCK:
+        raw = _load_raw()
+        raw["v"] = 2
+        b = _bucket(raw, user=user)
+        acc, _ = _accounts_bucket(b)
+        rec = acc.get(u)
+        if not isinstance(rec, dict):
+            rec = {}
+            acc[u] = rec
+
+        if _IS_WIN:
+            enc = _dpapi_encrypt(p.encode("utf-8"))
+            rec["password_dpapi_b64"] = binascii.b2a_base64(enc, newline=False).decode("ascii")
+            rec.pop("password_plain", None)
+            rec.pop("password_keyring", None)
         else:
-            try:
-                import keyring  # type: ignore
-                keyring.set_password("JM-Aura", f"{site_u}:{u}", p)
-                rec["password_keyring"] = True
-                rec.pop("password_plain", None)
-            except Exception:
-                # Fallback for containers/servers without keyring backend.
+            site_u = _site_user(user)
+            if _keyring_disabled():
                 rec["password_plain"] = p
                 rec["password_keyring"] = False
-        rec.pop("password_dpapi_b64", None)
+            else:
+                try:
+                    keyring = _keyring()
+                    if keyring is None:
+                        raise RuntimeError("keyring unavailable")
+                    keyring.set_password("JM-Aura", f"{site_u}:{u}", p)
+                    rec["password_keyring"] = True
+                    rec.pop("password_plain", None)
+                except Exception:
+                    # Fallback for containers/servers without keyring backend.
+                    rec["password_plain"] = p
+                    rec["password_keyring"] = False
+            rec.pop("password_dpapi_b64", None)
 
-    b["active"] = u
+        b["active"] = u
 
-    _save_raw(raw)
+        _save_raw(raw)
+
+
+def _keyring_delete_many(keyring: Any, names: list[str]) -> None:
+    # SecretService: one collection search instead of a DBus lookup per account.
+    try:
+        from keyring.backends import SecretService  # type: ignore
+
+        backend = keyring.get_keyring()
+        if isinstance(backend, SecretService.Keyring):
+            scheme = backend.schemes[backend.scheme]
+            wanted = set(names)
+            collection = backend.get_preferred_collection()
+            with contextlib.closing(collection.connection):
+                for item in collection.search_items({scheme["service"]: "JM-Aura"}):
+                    if item.get_attributes().get(scheme["username"]) in wanted:
+                        item.delete()
+            return
+    except Exception:
+        pass
+    for name in names:
+        try:
+            keyring.delete_password("JM-Aura", name)
+        except Exception:
+            pass
 
 
 def clear_credentials(*, user: str | None = None) -> None:
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, _ = _accounts_bucket(b)
-    if not sys.platform.startswith("win"):
-        if not _keyring_disabled():
-            try:
-                import keyring  # type: ignore
+    with _LOCK:
+        raw = _load_raw()
+        acc, active = _peek_accounts(raw, user=user)
+        if not acc and not active:
+            return
+        b = _bucket(raw, user=user)
+        acc, active = _accounts_bucket(b)
+        if not _IS_WIN:
+            keyring = None if _keyring_disabled() else _keyring()
+            if keyring is not None:
                 site_u = _site_user(user)
-                for k, rec in list(acc.items()):
-                    if isinstance(rec, dict) and rec.get("password_keyring") is True:
-                        try:
-                            keyring.delete_password("JM-Aura", f"{site_u}:{k}")
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-    b["accounts"] = {}
-    b["active"] = ""
-    _save_raw(raw)
+                names = [
+                    f"{site_u}:{k}"
+                    for k, rec in acc.items()
+                    if isinstance(rec, dict) and rec.get("password_keyring") is True
+                ]
+                if names:
+                    _keyring_delete_many(keyring, names)
+        b["accounts"] = {}
+        b["active"] = ""
+        _save_raw(raw)
 
 
 def get_username(*, user: str | None = None) -> str:
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    _, active = _accounts_bucket(b)
+    _, active = _peek_accounts(_load_raw(), user=user)
     return active
 
 
 def has_credentials(*, user: str | None = None) -> bool:
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, active = _accounts_bucket(b)
+    acc, active = _peek_accounts(_load_raw(), user=user)
     if not acc:
         return False
     u = active or next(iter(acc.keys()), "")
@@ -291,15 +414,13 @@ def has_credentials(*, user: str | None = None) -> bool:
     rec = acc.get(u)
     if not isinstance(rec, dict):
         return False
-    if sys.platform.startswith("win"):
+    if _IS_WIN:
         return bool(str(rec.get("password_dpapi_b64") or "").strip())
     return bool(rec.get("password_keyring") is True or str(rec.get("password_plain") or "").strip())
 
 
 def get_credentials(*, user: str | None = None, jm_username: str | None = None) -> tuple[str, str]:
-    raw = _load_raw()
-    b = _bucket(raw, user=user)
-    acc, active = _accounts_bucket(b)
+    acc, active = _peek_accounts(_load_raw(), user=user)
     want = str(jm_username or "").strip()
     u = want or active
     if not u:
@@ -309,21 +430,20 @@ def get_credentials(*, user: str | None = None, jm_username: str | None = None)
     rec = acc.get(u)
     if not isinstance(rec, dict):
         return "", ""
-    if sys.platform.startswith("win"):
+    if _IS_WIN:
         b64 = str(rec.get("password_dpapi_b64") or "").strip()
         if not b64:
             return "", ""
         try:
-            enc = base64.b64decode(b64.encode("ascii"), validate=True)
+            enc = binascii.a2b_base64(b64)
             plain = _dpapi_decrypt(enc).decode("utf-8")
             return u, plain
         except Exception:
             return "", ""
     if _keyring_disabled():
         return u, str(rec.get("password_plain") or "")
-    try:
-        import keyring  # type: ignore
-    except Exception:
+    keyring = _keyring()
+    if keyring is None:
         return u, str(rec.get("password_plain") or "")
     try:
         site_u = _site_user(user)
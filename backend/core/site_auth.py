@@ -1,44 +1,86 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import base64
+import functools
 import hashlib
 import hmac
-import json
 import os
+import re
 import secrets
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextvars import ContextVar
+from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException, Request
 
+from backend.core.json_file import atomic_write, dumps, loads
 from backend.core.paths import app_data_dir
 
 
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 current_site_user: ContextVar[str | None] = ContextVar("current_site_user", default=None)
 
+# Unicode letters/digits (str.isalnum) plus a few separators; \w covers "_".
+_USERNAME_RE = re.compile(r"[\w.@-]{1,64}")
+_GUEST_RE = re.compile(r"[\w-]{1,128}")
+
+# Parsed site_users.json shared by the read paths; re-read only when the file's stat changes.
+_USERS_CACHE: dict[str, Any] = {"path": None, "mtime_ns": 0, "size": -1, "data": None}
+_USERS_LOCK = threading.RLock()
+
 
+@functools.lru_cache(maxsize=1)
 def _user_store_path() -> str:
     if os.environ.get("JM_AURA_SITE_USERS_PATH"):
         return os.environ["JM_AURA_SITE_USERS_PATH"]
     if getattr(sys, "frozen", False):
         return os.path.join(app_data_dir(), "site_users.json")
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    return os.path.join(base_dir, "backend", "config", "site_users.json")
+    return os.path.join(_REPO_ROOT, "backend", "config", "site_users.json")
+
+
+def _stat_sig(p: str) -> tuple[int, int]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return 0, -1
+    return st.st_mtime_ns, st.st_size
 
 
 def _load_users() -> dict[str, Any]:
+    # Returns the shared cached dict; treat it as read-only outside _USERS_LOCK.
     p = _user_store_path()
+    with _USERS_LOCK:
+        mtime_ns, size = _stat_sig(p)
+        if (
+            _USERS_CACHE["data"] is not None
+            and _USERS_CACHE["path"] == p
+            and _USERS_CACHE["mtime_ns"] == mtime_ns
+            and _USERS_CACHE["size"] == size
+        ):
+            return _USERS_CACHE["data"]
+        d = _read_users(p)
+        _USERS_CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=d)
+        return d
+
+
+def _read_users(p: str) -> dict[str, Any]:
     if not os.path.exists(p):
         return {"v": 1, "users": {}}
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            d = json.load(f)
+        d = loads(Path(p).read_bytes())
         if not isinstance(d, dict):
             return {"v": 1, "users": {}}
         if "users" not in d or not isinstance(d.get("users"), dict):
             d["users"] = {}
+        else:
+            d["users"] = {sys.intern(k): v for k, v in d["users"].items()}
         return d
     except Exception:
         return {"v": 1, "users": {}}
@@ -46,25 +88,17 @@ def _load_users() -> dict[str, Any]:
 
 def _save_users(data: dict[str, Any]) -> None:
     p = _user_store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    try:
-        os.chmod(p, 0o600)
-    except Exception:
-        pass
+    with _USERS_LOCK:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        atomic_write(p, dumps(data), chmod=0o600)
+        mtime_ns, size = _stat_sig(p)
+        _USERS_CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
 
 
 def _norm_username(u: str) -> str:
     s = str(u or "").strip()
-    if not s:
-        return ""
-    if len(s) > 64:
-        return ""
-    for ch in s:
-        if not (ch.isalnum() or ch in ("-", "_", ".", "@")):
-            return ""
-    return s
+    # Interned so every session for a user shares one string with the users-file key.
+    return sys.intern(s) if _USERNAME_RE.fullmatch(s) else ""
 
 
 def has_any_user() -> bool:
@@ -81,8 +115,32 @@ def is_admin(username: str) -> bool:
     return bool(isinstance(info, dict) and info.get("is_admin") is True)
 
 
-def _hash_password(password: str, salt: bytes) -> bytes:
-    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200_000, dklen=32)
+# Records carry their own KDF parameters so the cost can be raised later; older ones are rehashed on login.
+_KDF_ALGO = "pbkdf2_sha256"
+_PBKDF2_ITERS = 200_000
+# hashlib releases the GIL inside pbkdf2_hmac, so threads run KDFs in parallel; workers start on demand.
+_KDF_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="site-kdf")
+
+
+def _hash_password(password: str, salt: bytes, iters: int = _PBKDF2_ITERS) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iters, dklen=32)
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_secret(salt_b64: str, hash_b64: str) -> tuple[bytes, bytes]:
+    # Keyed on the stored strings, so a rehash or password change naturally misses.
+    return base64.b64decode(salt_b64, validate=True), base64.b64decode(hash_b64, validate=True)
+
+
+def _password_fields(password: str) -> dict[str, Any]:
+    salt = secrets.token_bytes(16)
+    h = _hash_password(password, salt)
+    return {
+        "algo": _KDF_ALGO,
+        "iters": _PBKDF2_ITERS,
+        "salt_b64": base64.b64encode(salt).decode("ascii"),
+        "hash_b64": base64.b64encode(h).decode("ascii"),
+    }
 
 
 def create_user(username: str, password: str, admin: bool = False) -> None:
@@ -90,20 +148,22 @@ def create_user(username: str, password: str, admin: bool = False) -> None:
     p = str(password or "")
     if not u or len(p) < 6:
         raise ValueError("Invalid username or password")
-    d = _load_users()
-    users = d.get("users") if isinstance(d.get("users"), dict) else {}
-    if u in users:
+    if u in (_load_users().get("users") or {}):
         raise ValueError("User already exists")
-    salt = secrets.token_bytes(16)
-    h = _hash_password(p, salt)
-    users[u] = {
-        "salt_b64": base64.b64encode(salt).decode("ascii"),
-        "hash_b64": base64.b64encode(h).decode("ascii"),
-        "is_admin": bool(admin),
-        "created_at": int(time.time()),
-    }
-    d["users"] = users
-    _save_users(d)
+    # Hash outside the lock; the existence check is repeated below before writing.
+    fields = _password_fields(p)
+    with _USERS_LOCK:
+        d = _load_users()
+        users = d.get("users") if isinstance(d.get("users"), dict) else {}
+        if u in users:
+            raise ValueError("User already exists")
+        users[u] = {
+            **fields,
+            "is_admin": bool(admin),
+            "created_at": int(time.time()),
+        }
+        d["users"] = users
+        _save_users(d)
 
 
 def verify_user(username: str, password: str) -> bool:
@@ -115,74 +175,232 @@ def verify_user(username: str, password: str) -> bool:
     info = (d.get("users") or {}).get(u)
     if not isinstance(info, dict):
         return False
+    if (info.get("algo") or _KDF_ALGO) != _KDF_ALGO:
+        return False
     try:
-        salt = base64.b64decode(str(info.get("salt_b64") or ""), validate=True)
-        hh = base64.b64decode(str(info.get("hash_b64") or ""), validate=True)
+        iters = int(info.get("iters") or 200_000)
+        salt, hh = _decode_secret(str(info.get("salt_b64") or ""), str(info.get("hash_b64") or ""))
     except Exception:
         return False
-    calc = _hash_password(p, salt)
-    return hmac.compare_digest(calc, hh)
+    calc = _hash_password(p, salt, iters)
+    if not hmac.compare_digest(calc, hh):
+        return False
+    if iters != _PBKDF2_ITERS or "algo" not in info:
+        _rehash_user(u, info, p)
+    return True
+
+
+def _rehash_user(u: str, info: dict[str, Any], password: str) -> None:
+    fields = _password_fields(password)
+    with _USERS_LOCK:
+        d = _load_users()
+        users = d.get("users")
+        # Skip if the record was replaced while we were hashing.
+        if not isinstance(users, dict) or users.get(u) is not info:
+            return
+        info.update(fields)
+        try:
+            _save_users(d)
+        except Exception:
+            pass
+
+
+async def verify_user_async(username: str, password: str) -> bool:
+    # The KDF takes tens of milliseconds; keep it off the event loop for async callers.
+    return await asyncio.get_running_loop().run_in_executor(_KDF_POOL, verify_user, username, password)
+
+
+def verify_users_bulk(pairs: list[tuple[str, str]]) -> list[bool]:
+    # Results come back in input order; the KDFs run concurrently on _KDF_POOL.
+    return list(_KDF_POOL.map(lambda pair: verify_user(*pair), pairs))
+
+
+async def create_user_async(username: str, password: str, admin: bool = False) -> None:
+    await asyncio.get_running_loop().run_in_executor(_KDF_POOL, create_user, username, password, admin)
 
 
 _GUEST_COOKIE = "jm_aura_gid"
+_GUEST_TRANS = str.maketrans("-", "_")
+# API paths served without resolving a site/guest identity.
+_ALLOW_PREFIXES = ("/api/client-info",)
 _SESSION_COOKIE = "jm_aura_sid"
+# Loaded on first use by _get_sessions(), not at import.
 _sessions: dict[str, dict[str, Any]] = {}
+_sessions_loaded = False
+# username -> sids; in-memory only, rebuilt from _sessions at load.
+_user_sessions: dict[str, set[str]] = {}
 _SESSION_TTL_SEC = 7 * 86400
+_SESSIONS_LOCK = threading.RLock()
+
+# _sessions is authoritative; mutations only mark their shard dirty and one write per window persists them.
+# A crash loses at most the last few seconds of logins, which just means logging in again.
+_SESSIONS_FLUSH_DELAY_SEC = 5.0
+_SESSION_SHARDS = 16
+_dirty_shards: set[str] = set()
+_sessions_timer: threading.Timer | None = None
 
 
+@functools.lru_cache(maxsize=1)
 def _session_store_path() -> str:
     if os.environ.get("JM_AURA_SITE_SESSIONS_PATH"):
         return os.environ["JM_AURA_SITE_SESSIONS_PATH"]
     if getattr(sys, "frozen", False):
         return os.path.join(app_data_dir(), "site_sessions.json")
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    return os.path.join(base_dir, "backend", "config", "site_sessions.json")
+    return os.path.join(_REPO_ROOT, "backend", "config", "site_sessions.json")
 
 
-def _load_sessions() -> dict[str, dict[str, Any]]:
-    p = _session_store_path()
-    if not os.path.exists(p):
-        return {}
-    try:
-        with open(p, "r", encoding="utf-8") as f:
-            d = json.load(f)
-        if not isinstance(d, dict):
-            return {}
-        now = time.time()
-        out: dict[str, dict[str, Any]] = {}
-        for k, v in d.items():
-            sid = str(k or "").strip()
-            if not sid or len(sid) > 256:
-                continue
-            if not isinstance(v, dict):
-                continue
-            u = _norm_username(str(v.get("u") or ""))
-            if not u:
-                continue
+def _reset_paths_cache() -> None:
+    # For tests that point the JM_AURA_SITE_* env vars elsewhere after import.
+    _user_store_path.cache_clear()
+    _session_store_path.cache_clear()
+
+
+def _session_shard(sid: str) -> str:
+    return format(hashlib.blake2b(sid.encode("utf-8"), digest_size=1).digest()[0] % _SESSION_SHARDS, "x")
+
+
+def _shard_path(shard: str) -> str:
+    root, ext = os.path.splitext(_session_store_path())
+    return f"{root}_{shard}{ext or '.json'}"
+
+
+def _all_shards() -> list[str]:
+    return [format(i, "x") for i in range(_SESSION_SHARDS)]
+
+
+def _parse_sessions(d: dict[str, Any], now: float, out: dict[str, dict[str, Any]]) -> None:
+    norm = _norm_username
+    for k, v in d.items():
+        if not isinstance(v, dict):
+            continue
+        sid = k.strip() if isinstance(k, str) else str(k or "").strip()
+        if not sid or len(sid) > 256:
+            continue
+        u = norm(v.get("u"))
+        if not u:
+            continue
+        exp = v.get("exp")
+        if not isinstance(exp, float):
             try:
-                exp = float(v.get("exp") or 0.0)
+                exp = float(exp or 0.0)
             except Exception:
                 exp = 0.0
-            if exp and exp <= now:
-                continue
-            out[sid] = {"u": u, "exp": exp}
-        return out
-    except Exception:
-        return {}
+        if exp and exp <= now:
+            continue
+        out[sid] = {"u": u, "exp": exp}
 
 
-def _save_sessions(data: dict[str, Any]) -> None:
-    p = _session_store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    try:
-        os.chmod(p, 0o600)
-    except Exception:
-        pass
+def _gc_sessions() -> None:
+    # Drops every expired session in one pass instead of waiting for each to be looked up.
+    now = time.time()
+    with _SESSIONS_LOCK:
+        dead = [sid for sid, rec in _get_sessions().items() if 0 < rec["exp"] <= now]
+        for sid in dead:
+            _drop_session(sid)
+        _dirty_shards.update(map(_session_shard, dead))
+
+
+def _index_sessions(sessions: dict[str, dict[str, Any]]) -> dict[str, set[str]]:
+    out: dict[str, set[str]] = {}
+    for sid, rec in sessions.items():
+        out.setdefault(rec["u"], set()).add(sid)
+    return out
+
+
+def _drop_session(sid: str) -> bool:
+    # Caller holds _SESSIONS_LOCK and marks the shard dirty.
+    rec = _sessions.pop(sid, None)
+    if rec is None:
+        return False
+    sids = _user_sessions.get(rec["u"])
+    if sids is not None:
+        sids.discard(sid)
+        if not sids:
+            del _user_sessions[rec["u"]]
+    return True
+
+
+def _load_sessions() -> dict[str, dict[str, Any]]:
+    # Reads every shard plus the pre-sharding single file, if one is still around.
+    now = time.time()
+    out: dict[str, dict[str, Any]] = {}
+    for p in [_session_store_path(), *map(_shard_path, _all_shards())]:
+        if not os.path.exists(p):
+            continue
+        try:
+            d = loads(Path(p).read_bytes())
+        except Exception:
+            continue
+        if isinstance(d, dict):
+            _parse_sessions(d, now, out)
+    return out
+
+
+def _save_sessions(data: dict[str, Any], shards: set[str]) -> None:
+    buckets: dict[str, dict[str, Any]] = {sh: {} for sh in shards}
+    for sid, rec in data.items():
+        b = buckets.get(_session_shard(sid))
+        if b is not None:
+            b[sid] = rec
+    os.makedirs(os.path.dirname(_session_store_path()), exist_ok=True)
+    for sh, b in buckets.items():
+        # Losing the tail of a session write only logs people out, so skip the fsync.
+        atomic_write(_shard_path(sh), dumps(b), fsync=False, chmod=0o600)
+    if len(shards) == _SESSION_SHARDS:
+        # Every shard is on disk now, so the legacy single file is redundant.
+        try:
+            os.remove(_session_store_path())
+        except OSError:
+            pass
+
+
+def _mark_sessions_dirty(*sids: str) -> None:
+    global _sessions_timer
+    with _SESSIONS_LOCK:
+        _dirty_shards.update(map(_session_shard, sids))
+        if _sessions_timer is None:
+            _sessions_timer = threading.Timer(_SESSIONS_FLUSH_DELAY_SEC, flush_sessions)
+            _sessions_timer.daemon = True
+            _sessions_timer.start()
+
+
+def flush_sessions() -> None:
+    global _sessions_timer
+    with _SESSIONS_LOCK:
+        t = _sessions_timer
+        _sessions_timer = None
+        if t is not None and t is not threading.current_thread():
+            t.cancel()
+        if not _sessions_loaded:
+            return
+        _gc_sessions()
+        if not _dirty_shards:
+            return
+        shards = set(_dirty_shards)
+        _dirty_shards.clear()
+        try:
+            _save_sessions(_sessions, shards)
+        except Exception:
+            _dirty_shards.update(shards)
+
 
+atexit.register(flush_sessions)
 
-_sessions = _load_sessions()
+
+def _get_sessions() -> dict[str, dict[str, Any]]:
+    global _sessions_loaded
+    if _sessions_loaded:
+        return _sessions
+    with _SESSIONS_LOCK:
+        if not _sessions_loaded:
+            _sessions.update(_load_sessions())
+            _user_sessions.update(_index_sessions(_sessions))
+            _sessions_loaded = True
+            if os.path.exists(_session_store_path()):
+                # Pre-sharding file: rewrite everything into shards on the first flush.
+                _dirty_shards.update(_all_shards())
+                _mark_sessions_dirty()
+    return _sessions
 
 
 def create_session(username: str) -> str:
@@ -190,39 +408,51 @@ def create_session(username: str) -> str:
     if not u:
         raise ValueError("Invalid username")
     sid = secrets.token_urlsafe(32)
-    _sessions[sid] = {"u": u, "exp": time.time() + _SESSION_TTL_SEC}
-    try:
-        _save_sessions(_sessions)
-    except Exception:
-        pass
+    with _SESSIONS_LOCK:
+        _get_sessions()[sid] = {"u": u, "exp": time.time() + _SESSION_TTL_SEC}
+        _user_sessions.setdefault(u, set()).add(sid)
+        _mark_sessions_dirty(sid)
     return sid
 
 
 def clear_session(sid: str) -> None:
     if sid:
-        _sessions.pop(sid, None)
-        try:
-            _save_sessions(_sessions)
-        except Exception:
-            pass
+        with _SESSIONS_LOCK:
+            _get_sessions()
+            # Unknown or already-expired sids (stale logouts) don't touch the disk.
+            if _drop_session(sid):
+                _mark_sessions_dirty(sid)
+
+
+def clear_user_sessions(username: str) -> int:
+    # Logs a user out everywhere; returns how many sessions were dropped.
+    u = _norm_username(username)
+    if not u:
+        return 0
+    with _SESSIONS_LOCK:
+        _get_sessions()
+        sids = list(_user_sessions.get(u) or ())
+        for sid in sids:
+            _drop_session(sid)
+        if sids:
+            _mark_sessions_dirty(*sids)
+    return len(sids)
 
 
 def get_session_user(sid: str) -> str | None:
     if not sid:
         return None
-    rec = _sessions.get(sid)
+    rec = _get_sessions().get(sid)
     if not isinstance(rec, dict):
         return None
     exp = float(rec.get("exp") or 0.0)
     if exp and time.time() > exp:
-        _sessions.pop(sid, None)
-        try:
-            _save_sessions(_sessions)
-        except Exception:
-            pass
+        with _SESSIONS_LOCK:
+            if _drop_session(sid):
+                _mark_sessions_dirty(sid)
         return None
-    u = str(rec.get("u") or "").strip()
-    return _norm_username(u) or None
+    # Stored names were normalized by create_session/_load_sessions.
+    return rec.get("u") or None
 
 
 def get_current_user(request: Request) -> str | None:
@@ -232,18 +462,11 @@ def get_current_user(request: Request) -> str | None:
 
 def get_guest_id(request: Request) -> str | None:
     v = str(request.cookies.get(_GUEST_COOKIE) or "").strip()
-    if not v:
-        return None
-    if len(v) > 128:
-        return None
-    for ch in v:
-        if not (ch.isalnum() or ch in ("-", "_")):
-            return None
-    return v
+    return v if _GUEST_RE.fullmatch(v) else None
 
 
 def new_guest_id() -> str:
-    return secrets.token_urlsafe(18).replace("-", "_")
+    return secrets.token_urlsafe(18).translate(_GUEST_TRANS)
 
 
 def get_effective_user(request: Request) -> tuple[str, bool, str | None]:
@@ -265,12 +488,8 @@ def require_site_user(request: Request) -> str:
 
 
 def site_auth_middleware_allow(path: str) -> bool:
-    p = str(path or "")
-    if not p.startswith("/api/"):
-        return True
-    if p.startswith("/api/client-info"):
-        return True
-    return False
+    p = path if isinstance(path, str) else str(path or "")
+    return not p.startswith("/api/") or p.startswith(_ALLOW_PREFIXES)
 
 
 def get_session_cookie_name() -> str:
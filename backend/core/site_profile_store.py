@@ -1,30 +1,56 @@
 from __future__ import annotations
 
-import json
+import atexit
+import copy
+import functools
 import os
 import sys
+import threading
 import time
+from pathlib import Path
 from typing import Any
 
+from backend.core.json_file import atomic_write, dumps, loads
 from backend.core.paths import app_data_dir
 
 
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_ALLOWED_COLORS = frozenset(("default", "orange", "green", "yuuka"))
+_FEATURE_KEYS = ("savePassword", "autoLogin", "autoCheckin")
+
+# Parsed store shared across calls; re-read only when the file's stat changes.
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": 0, "size": -1, "data": None}
+_LOCK = threading.RLock()
+
+# patch_profile only marks the cache dirty; one write per debounce window persists a burst of toggles.
+_FLUSH_DELAY_SEC = 0.5
+_dirty = False
+_flush_timer: threading.Timer | None = None
+
+
+@functools.lru_cache(maxsize=1)
 def _store_path() -> str:
     if os.environ.get("JM_AURA_SITE_PROFILE_PATH"):
         return os.environ["JM_AURA_SITE_PROFILE_PATH"]
     if getattr(sys, "frozen", False):
         return os.path.join(app_data_dir(), "site_profiles.json")
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    return os.path.join(base_dir, "backend", "config", "site_profiles.json")
+    return os.path.join(_REPO_ROOT, "backend", "config", "site_profiles.json")
 
 
-def _load_raw() -> dict[str, Any]:
-    p = _store_path()
+def _stat_sig(p: str) -> tuple[int, int]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return 0, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(p: str) -> dict[str, Any]:
     if not os.path.exists(p):
         return {"v": 1, "users": {}}
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            v = json.load(f)
+        v = loads(Path(p).read_bytes())
         if not isinstance(v, dict):
             return {"v": 1, "users": {}}
         if "users" not in v or not isinstance(v.get("users"), dict):
@@ -34,59 +60,121 @@ def _load_raw() -> dict[str, Any]:
         return {"v": 1, "users": {}}
 
 
+def _load_raw() -> dict[str, Any]:
+    # Returns the shared cached dict; mutators edit it in place under _LOCK and call _mark_dirty.
+    p = _store_path()
+    with _LOCK:
+        if _dirty and _CACHE["data"] is not None:
+            return _CACHE["data"]
+        mtime_ns, size = _stat_sig(p)
+        if (
+            _CACHE["data"] is not None
+            and _CACHE["path"] == p
+            and _CACHE["mtime_ns"] == mtime_ns
+            and _CACHE["size"] == size
+        ):
+            return _CACHE["data"]
+        data = _read_file(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+        return data
+
+
 def _save_raw(data: dict[str, Any]) -> None:
     p = _store_path()
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    with _LOCK:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        atomic_write(p, dumps(data), fsync=False)
+        mtime_ns, size = _stat_sig(p)
+        _CACHE.update(path=p, mtime_ns=mtime_ns, size=size, data=data)
+
+
+def _mark_dirty() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        _dirty = True
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_DELAY_SEC, flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush() -> None:
+    global _dirty, _flush_timer
+    with _LOCK:
+        t = _flush_timer
+        _flush_timer = None
+        if t is not None and t is not threading.current_thread():
+            t.cancel()
+        data = _CACHE["data"]
+        if not _dirty or data is None:
+            return
+        _dirty = False
+        try:
+            _save_raw(data)
+        except Exception:
+            _dirty = True
+            raise
+
+
+atexit.register(flush)
 
 
 def get_profile(username: str) -> dict[str, Any]:
     u = str(username or "").strip()
     if not u:
         return {}
-    raw = _load_raw()
-    users = raw.get("users")
-    if not isinstance(users, dict):
-        return {}
-    v = users.get(u)
-    return v if isinstance(v, dict) else {}
+    with _LOCK:
+        raw = _load_raw()
+        users = raw.get("users")
+        if not isinstance(users, dict):
+            return {}
+        v = users.get(u)
+        # Copy so the response can be serialized while later patches edit the cache.
+        return copy.deepcopy(v) if isinstance(v, dict) else {}
 
 
 def patch_profile(username: str, patch: dict[str, Any]) -> dict[str, Any]:
     u = str(username or "").strip()
     if not u:
         return {}
-    raw = _load_raw()
-    users = raw.get("users")
-    if not isinstance(users, dict):
-        users = {}
-        raw["users"] = users
-    cur = users.get(u)
-    if not isinstance(cur, dict):
-        cur = {}
-        users[u] = cur
-
-    if isinstance(patch.get("theme"), dict):
-        t = patch.get("theme") or {}
-        out: dict[str, Any] = {}
-        if isinstance(t.get("dark"), bool):
-            out["dark"] = bool(t.get("dark"))
-        c = str(t.get("color") or "").strip().lower()
-        if c in ("default", "orange", "green", "yuuka"):
-            out["color"] = c
-        cur["theme"] = {**(cur.get("theme") if isinstance(cur.get("theme"), dict) else {}), **out}
-
-    if isinstance(patch.get("features"), dict):
-        f = patch.get("features") or {}
-        out2: dict[str, Any] = {}
-        for k in ("savePassword", "autoLogin", "autoCheckin"):
-            if isinstance(f.get(k), bool):
-                out2[k] = bool(f.get(k))
-        cur["features"] = {**(cur.get("features") if isinstance(cur.get("features"), dict) else {}), **out2}
-
-    cur["updated_at"] = int(time.time())
-    raw["v"] = 1
-    _save_raw(raw)
-    return cur
-
+    with _LOCK:
+        raw = _load_raw()
+        users = raw.get("users")
+        if not isinstance(users, dict):
+            users = {}
+            raw["users"] = users
+        cur = users.get(u)
+        if not isinstance(cur, dict):
+            cur = {}
+            users[u] = cur
+
+        if isinstance(patch.get("theme"), dict):
+            t = patch.get("theme") or {}
+            out: dict[str, Any] = {}
+            if isinstance(t.get("dark"), bool):
+                out["dark"] = bool(t.get("dark"))
+            c = str(t.get("color") or "").strip().lower()
+            if c in _ALLOWED_COLORS:
+                out["color"] = c
+            theme = cur.get("theme")
+            if not isinstance(theme, dict):
+                theme = {}
+                cur["theme"] = theme
+            theme.update(out)
+
+        if isinstance(patch.get("features"), dict):
+            f = patch.get("features") or {}
+            out2: dict[str, Any] = {}
+            for k in _FEATURE_KEYS:
+                if isinstance(f.get(k), bool):
+                    out2[k] = bool(f.get(k))
+            features = cur.get("features")
+            if not isinstance(features, dict):
+                features = {}
+                cur["features"] = features
+            features.update(out2)
+
+        cur["updated_at"] = int(time.time())
+        raw["v"] = 1
+        _mark_dirty()
+        return copy.deepcopy(cur)
@@ -3,13 +3,16 @@ from __future__ import annotations
 import os
 from dotenv import load_dotenv
 load_dotenv()
-import copy
+import contextvars
+import functools
+import http.cookiejar
 import re
 import shutil
 import threading
 import time
-import io
-from queue import Queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any
 from urllib.parse import urlparse
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -17,16 +20,26 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 import requests
-from fastapi import BackgroundTasks, Body, FastAPI, HTTPException, UploadFile, File, Request
+from fastapi import BackgroundTasks, Body, Depends, FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+try:
+    import yaml
+except Exception:
+    yaml = None
 
 from backend.core.api_adapter import adapt_album_detail, adapt_chapter_detail, adapt_favorites, adapt_search_result
 from backend.core.config import GlobalConfig
 from backend.core.http_session import clear_cookies, get_session, migrate_legacy_cookies_to_user, save_cookies
-from backend.core.jm_context import current_jm_identity
+from backend.core.jm_context import current_jm_identity, current_jm_session
 from backend.core.jm_store import add_favorite_ids, clear_current_user_data, is_favorite, set_favorite, set_favorite_ids, set_user_id, set_user_profile
 from backend.core.site_profile_store import get_profile as get_site_profile, patch_profile as patch_site_profile
 from backend.core.aura_library_store import (
@@ -85,17 +98,35 @@ from backend.core.req import (
 )
 from backend.jm_service import jm_service
 from backend.download_task_manager import DownloadTaskManager
+from backend.models.schemas import ComicSummary
 from backend.providers.base import NeedLoginError, ProviderError
 from backend.providers.jm_provider import JmProvider
 from backend.providers.registry import get_provider, register_provider
 import traceback
 
-app = FastAPI(title="JM-Dashboard")
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TASKS_DIR = os.path.join(_REPO_ROOT, "downloads", "tasks")
+
+
+class _DefaultJSONResponse(JSONResponse):
+    # orjson when available (FastAPI's ORJSONResponse is deprecated). json.dumps stringifies
+    # non-str keys, so OPT_NON_STR_KEYS keeps payloads serializing the same as before.
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_bytes_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+app = FastAPI(title="JM-Dashboard", default_response_class=_DefaultJSONResponse)
 
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(GZipMiddleware, minimum_size=800)
+app.add_middleware(GZipMiddleware, minimum_size=2048)
 
 @app.on_event("startup")
 async def on_startup():
@@ -111,41 +142,167 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"st": 500, "msg": "Internal Server Error", "detail": str(exc)}
     )
 
+class _SiteAuthRequired(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(status_code=401, detail="Not authenticated")
+
+
+@app.exception_handler(_SiteAuthRequired)
+async def site_auth_required_handler(request: Request, exc: _SiteAuthRequired):
+    return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+
+
+async def require_site_user(request: Request) -> str:
+    u = get_site_user(request)
+    if not u:
+        raise _SiteAuthRequired()
+    return u
+
 register_provider("jm", JmProvider())
 
-_PROMOTE_CACHE: dict[str, tuple[float, Any]] = {}
+_PROMOTE_CACHE: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
 _PROMOTE_CACHE_LOCK = threading.Lock()
 _PROMOTE_TTL_SEC = 5.0
+_PROMOTE_CACHE_MAX = 1024
+# Striped fetch locks: a page always maps to the same one, so concurrent misses on it coalesce
+# without touching _PROMOTE_CACHE_LOCK.
+_PROMOTE_FETCH_LOCKS = tuple(threading.Lock() for _ in range(8))
+
+# site_auth_middleware_allow decisions per path; FIFO-bounded so id-bearing paths can't grow it forever.
+_ALLOW_CACHE: dict[str, bool] = {}
+_ALLOW_CACHE_MAX = 512
+
 
-_JM_REGISTER_SESSIONS: dict[str, requests.Session] = {}
-_JM_REGISTER_SESSIONS_LOCK = threading.Lock()
+def _s(x: Any) -> str:
+    # Most inputs are already str; skip the str() round-trip for them.
+    return x.strip() if type(x) is str else str(x or "").strip()
 
 
-def _get_jm_register_session(site_user: str) -> requests.Session:
+def _evict_expired(cache: OrderedDict, now: float, ttl: float, maxsize: int) -> None:
+    # Entries are kept in insertion/refresh order, so expired ones sit at the front.
+    while cache:
+        ts = next(iter(cache.values()))[0]
+        if len(cache) <= maxsize and (now - ts) <= ttl:
+            break
+        cache.popitem(last=False)
+
+
+def _path_allowed(path: str) -> bool:
+    v = _ALLOW_CACHE.get(path)
+    if v is None:
+        v = site_auth_middleware_allow(path)
+        if len(_ALLOW_CACHE) >= _ALLOW_CACHE_MAX:
+            try:
+                _ALLOW_CACHE.pop(next(iter(_ALLOW_CACHE)))
+            except (StopIteration, KeyError, RuntimeError):
+                pass
+        _ALLOW_CACHE[path] = v
+    return v
+
+
+class _RejectCookies(http.cookiejar.DefaultCookiePolicy):
+    def set_ok(self, cookie, request):
+        return False
+
+
+# One pooled Session for all JM web calls; cookies live in per-user jars so the shared
+# Session's own jar must never pick any up.
+_JM_WEB_SESSION: requests.Session | None = None
+_JM_WEB_JARS: OrderedDict[str, tuple[float, requests.cookies.RequestsCookieJar]] = OrderedDict()
+_JM_WEB_LOCK = threading.Lock()
+_JM_WEB_JARS_MAX = 256
+_JM_WEB_JARS_TTL_SEC = 3600.0
+
+
+def _get_jm_register_session(site_user: str) -> tuple[requests.Session, requests.cookies.RequestsCookieJar]:
+    global _JM_WEB_SESSION
     key = str(site_user or "").strip() or "anon"
-    with _JM_REGISTER_SESSIONS_LOCK:
-        s = _JM_REGISTER_SESSIONS.get(key)
-        if s is not None:
-            return s
-        s = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
-        s.mount("http://", adapter)
-        s.mount("https://", adapter)
-        _JM_REGISTER_SESSIONS[key] = s
-        return s
+    with _JM_WEB_LOCK:
+        s = _JM_WEB_SESSION
+        if s is None:
+            s = requests.Session()
+            s.cookies.set_policy(_RejectCookies())
+            s.headers.update(_JM_WEB_HEADERS_BASE)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=50, pool_block=False)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _JM_WEB_SESSION = s
+        now = time.time()
+        hit = _JM_WEB_JARS.pop(key, None)
+        jar = hit[1] if hit and (now - hit[0]) <= _JM_WEB_JARS_TTL_SEC else requests.cookies.RequestsCookieJar()
+        _JM_WEB_JARS[key] = (now, jar)
+        _evict_expired(_JM_WEB_JARS, now, _JM_WEB_JARS_TTL_SEC, _JM_WEB_JARS_MAX)
+        return s, jar
 
 
-def _jm_web_headers(referer: str | None = None) -> dict[str, str]:
-    h: dict[str, str] = {
+def _merge_jm_cookies(jar: requests.cookies.RequestsCookieJar, r: requests.Response) -> None:
+    for resp in (*(getattr(r, "history", None) or ()), r):
+        for c in resp.cookies:
+            jar.set_cookie(c)
+
+
+# Fixed for the process lifetime.
+_SITE_SESSION_COOKIE = get_site_session_cookie_name()
+_SITE_GUEST_COOKIE = get_site_guest_cookie_name()
+
+_OP_YML_CACHE: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+_OP_YML_LOCK = threading.Lock()
+
+_SEARCH_ID_RE = re.compile(r"(?:jm\s*)?(\d{3,})")
+_TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+_JM_WEB_HEADERS_BASE = MappingProxyType(
+    {
         "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
         "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
         "accept-language": "zh-CN,zh;q=0.9,en;q=0.8",
         "cache-control": "no-cache",
         "pragma": "no-cache",
     }
-    if referer:
-        h["referer"] = str(referer)
-    return h
+)
+
+
+def _jm_web_headers(referer: str | None = None) -> dict[str, str]:
+    # The constant headers live on the shared Session; only per-call extras go here.
+    return {"referer": str(referer)} if referer else {}
+
+
+# Short-lived memo of credential-store lookups per site user; the UI polls /api/config and
+# /api/credentials, and the middleware asks for the active JM account on every request.
+_CRED_CACHE: dict[tuple[str, str], tuple[float, Any]] = {}
+_CRED_CACHE_LOCK = threading.Lock()
+_CRED_TTL_SEC = 2.0
+_CRED_CACHE_MAX = 1024
+
+
+def _cred_key(user: str | None) -> str:
+    return str(user or current_site_user.get() or "").strip() or "anon"
+
+
+def _cred_cached(kind: str, user: str | None, fn) -> Any:
+    key = (kind, _cred_key(user))
+    now = time.time()
+    hit = _CRED_CACHE.get(key)
+    if hit and (now - hit[0]) <= _CRED_TTL_SEC:
+        return hit[1]
+    v = fn()
+    with _CRED_CACHE_LOCK:
+        if len(_CRED_CACHE) >= _CRED_CACHE_MAX:
+            _CRED_CACHE.clear()
+        _CRED_CACHE[key] = (now, v)
+    return v
+
+
+def _drop_cred_cache(user: str | None = None) -> None:
+    u = _cred_key(user)
+    with _CRED_CACHE_LOCK:
+        _CRED_CACHE.pop(("username", u), None)
+        _CRED_CACHE.pop(("saved", u), None)
+
+
+def _saved_username(user: str | None = None) -> str:
+    return _cred_cached("username", user, lambda: get_username(user=user))
 
 
 def _should_secure_cookie(request: Request) -> bool:
@@ -171,6 +328,7 @@ def _has_live_jm_session() -> bool:
     try:
         req = GetFavoritesReq2(page=1, fid="0")
         req.timeout = 4
+        req.no_cache = True
         req.execute()
         return True
     except Exception as e:
@@ -182,88 +340,130 @@ def _has_live_jm_session() -> bool:
             return False
 
 
-@app.middleware("http")
-async def site_auth_middleware(request: Request, call_next):
-    if site_auth_middleware_allow(request.url.path):
-        return await call_next(request)
-    u, is_auth, new_gid = get_effective_user(request)
-    token = current_site_user.set(u)
-    jm_token = None
-    try:
-        identity = str(u or "").strip() or "anon"
-        if is_auth:
+def _guest_cookie_header(gid: str, secure: bool) -> bytes:
+    # Let Starlette format the Set-Cookie value exactly as Response.set_cookie would.
+    r = Response()
+    r.set_cookie(
+        _SITE_GUEST_COOKIE,
+        gid,
+        httponly=True,
+        samesite="lax",
+        secure=secure,
+        max_age=365 * 86400,
+    )
+    return r.headers["set-cookie"].encode("latin-1")
+
+
+class SiteAuthMiddleware:
+    # Plain ASGI instead of @app.middleware("http"): no BaseHTTPMiddleware task group or response re-wrapping per request.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or _path_allowed(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        u, is_auth, new_gid = get_effective_user(request)
+        token = current_site_user.set(u)
+        jm_token = None
+        try:
+            identity = str(u or "").strip() or "anon"
+            if is_auth:
+                try:
+                    active_jm = _saved_username(identity)
+                    if active_jm:
+                        identity = f"{identity}#jm#{active_jm}"
+                except Exception:
+                    pass
+            jm_token = current_jm_identity.set(identity)
+        except Exception:
+            jm_token = current_jm_identity.set(str(u or "").strip() or "anon")
+        # Guests get a fresh identity per cookieless request; resolving their session eagerly would
+        # churn the session LRU and evict logged-in users. get_session() still finds it on demand.
+        sess_token = current_jm_session.set(get_session(current_jm_identity.get()) if is_auth else None)
+
+        if new_gid:
+            cookie = _guest_cookie_header(new_gid, _should_secure_cookie(request))
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", ()), (b"set-cookie", cookie)]
+                await send(message)
+        else:
+            send_wrapper = send
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_jm_session.reset(sess_token)
             try:
-                active_jm = get_username(user=identity)
-                if active_jm:
-                    identity = f"{identity}#jm#{active_jm}"
+                if jm_token is not None:
+                    current_jm_identity.reset(jm_token)
             except Exception:
                 pass
-        jm_token = current_jm_identity.set(identity)
-    except Exception:
-        jm_token = current_jm_identity.set(str(u or "").strip() or "anon")
+            current_site_user.reset(token)
+
+
+app.add_middleware(SiteAuthMiddleware)
+
+
+def _op_yml_client_cfg(p: str) -> dict[str, Any] | None:
+    # Parsed "client" section of op.yml, re-read only when the file's stat changes.
     try:
-        resp = await call_next(request)
-        if new_gid:
-            resp.set_cookie(
-                get_site_guest_cookie_name(),
-                new_gid,
-                httponly=True,
-                samesite="lax",
-                secure=_should_secure_cookie(request),
-                max_age=365 * 86400,
-            )
-        return resp
-    finally:
-        try:
-            if jm_token is not None:
-                current_jm_identity.reset(jm_token)
-        except Exception:
-            pass
-        current_site_user.reset(token)
+        st = os.stat(p)
+    except OSError:
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    with _OP_YML_LOCK:
+        hit = _OP_YML_CACHE.get(p)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    with open(p, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    client_cfg = cfg.get("client") if isinstance(cfg, dict) and isinstance(cfg.get("client"), dict) else {}
+    with _OP_YML_LOCK:
+        _OP_YML_CACHE[p] = (sig, client_cfg)
+    return client_cfg
+
 
 def _migrate_op_yml_credentials(target_site_user: str) -> None:
-    try:
-        import yaml
-    except Exception:
-        yaml = None
     if not yaml:
         return
     try:
         if not jm_service or not getattr(jm_service, "config_path", None):
             return
         p = str(jm_service.config_path)
-        if not p or not os.path.exists(p):
+        if not p:
             return
-        with open(p, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
-        if not isinstance(cfg, dict):
+        client_cfg = _op_yml_client_cfg(p)
+        if not client_cfg or ("username" not in client_cfg and "password" not in client_cfg):
             return
-        client_cfg = cfg.get("client") if isinstance(cfg.get("client"), dict) else {}
-        u = str((client_cfg or {}).get("username") or "").strip()
-        pw = str((client_cfg or {}).get("password") or "").strip()
+        u = str(client_cfg.get("username") or "").strip()
+        pw = str(client_cfg.get("password") or "").strip()
         if u and pw and not has_credentials(user=target_site_user):
             try:
                 set_credentials(u, pw, user=target_site_user)
+                _drop_cred_cache(target_site_user)
             except Exception:
                 pass
-        if ("username" in (client_cfg or {})) or ("password" in (client_cfg or {})):
-            try:
-                jm_service.update_config("", "")
-            except Exception:
-                pass
+        try:
+            jm_service.update_config("", "")
+        except Exception:
+            pass
     except Exception:
         return
 
 
 @app.get("/api/client-info")
-def client_info(request: Request):
+async def client_info(request: Request):
     xff = (request.headers.get("x-forwarded-for") or "").split(",")[0].strip()
     ip = xff or (request.client.host if request.client else "")
     return ok({"ip": ip}, msg="")
 
 
 @app.get("/api/jm/debug")
-def jm_debug():
+async def jm_debug():
     return ok(
         {
             "api_base": get_current_api_base(),
@@ -275,6 +475,7 @@ def jm_debug():
 
 
 class SiteAuthRequest(BaseModel):
+    # Login/register coerce both fields to str themselves and build this with model_construct.
     username: str
     password: str
 
@@ -304,7 +505,7 @@ def jm_binding_status(request: Request):
     site_u = get_site_user(request)
     site_logged_in = bool(site_u)
     has_saved = bool(has_credentials(user=site_u)) if site_u else False
-    saved_jm_username = get_username(user=site_u) if site_u else ""
+    saved_jm_username = _saved_username(site_u) if site_u else ""
     jm_logged_in = _has_live_jm_session()
     
     return ok(
@@ -331,11 +532,12 @@ def jm_unbind(request: Request):
             clear_credentials(user=site_u)
         except Exception:
             pass
+        _drop_cred_cache(site_u)
     return ok({"status": "success"}, msg="")
 
 
 @app.get("/api/site/status")
-def site_status():
+async def site_status():
     return ok({"has_users": bool(has_any_site_user())}, msg="")
 
 
@@ -343,7 +545,7 @@ def site_status():
 @limiter.limit("5/minute")
 def site_register(request: Request, req: dict[str, Any] = Body(...)):
     req = req if isinstance(req, dict) else {}
-    auth = SiteAuthRequest(username=str(req.get("username") or ""), password=str(req.get("password") or ""))
+    auth = SiteAuthRequest.model_construct(username=str(req.get("username") or ""), password=str(req.get("password") or ""))
     admin_flag = not has_any_site_user()
     try:
         create_site_user(auth.username, auth.password, admin=admin_flag)
@@ -362,7 +564,7 @@ def site_register(request: Request, req: dict[str, Any] = Body(...)):
         pass
     resp = JSONResponse(ok({"username": auth.username, "is_admin": bool(admin_flag)}, msg=""))
     resp.set_cookie(
-        get_site_session_cookie_name(),
+        _SITE_SESSION_COOKIE,
         sid,
         httponly=True,
         samesite="lax",
@@ -376,7 +578,7 @@ def site_register(request: Request, req: dict[str, Any] = Body(...)):
 @limiter.limit("10/minute")
 def site_login(request: Request, req: dict[str, Any] = Body(...)):
     req = req if isinstance(req, dict) else {}
-    auth = SiteAuthRequest(username=str(req.get("username") or ""), password=str(req.get("password") or ""))
+    auth = SiteAuthRequest.model_construct(username=str(req.get("username") or ""), password=str(req.get("password") or ""))
     if not auth.username or not auth.password:
         return JSONResponse(err(Status.UserError, "Username and password required"), status_code=400)
     
@@ -398,6 +600,7 @@ def site_login(request: Request, req: dict[str, Any] = Body(...)):
     sid = create_site_session(auth.username)
     # Always save credentials to allow auto re-login
     set_credentials(auth.username, auth.password, user=auth.username)
+    _drop_cred_cache(auth.username)
     
     try:
         _migrate_op_yml_credentials(str(auth.username or "").strip())
@@ -410,7 +613,7 @@ def site_login(request: Request, req: dict[str, Any] = Body(...)):
         
     resp = JSONResponse(ok({"username": auth.username, "is_admin": bool(is_site_admin(auth.username))}, msg=""))
     resp.set_cookie(
-        get_site_session_cookie_name(),
+        _SITE_SESSION_COOKIE,
         sid,
         httponly=True,
         samesite="lax",
@@ -422,34 +625,25 @@ def site_login(request: Request, req: dict[str, Any] = Body(...)):
 
 @app.post("/api/site/logout")
 def site_logout(request: Request):
-    sid = str(request.cookies.get(get_site_session_cookie_name()) or "")
+    sid = str(request.cookies.get(_SITE_SESSION_COOKIE) or "")
     clear_site_session(sid)
     resp = JSONResponse(ok({"status": "success"}, msg=""))
-    resp.delete_cookie(get_site_session_cookie_name())
+    resp.delete_cookie(_SITE_SESSION_COOKIE)
     return resp
 
 
 @app.get("/api/site/me")
-def site_me(request: Request):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+async def site_me(u: str = Depends(require_site_user)):
     return ok({"username": u, "is_admin": bool(is_site_admin(u))}, msg="")
 
 
 @app.get("/api/site/profile")
-def site_profile_get(request: Request):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+def site_profile_get(u: str = Depends(require_site_user)):
     return ok(get_site_profile(u), msg="")
 
 
 @app.post("/api/site/profile")
-def site_profile_patch(req: SiteProfileRequest, request: Request):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+def site_profile_patch(req: SiteProfileRequest, u: str = Depends(require_site_user)):
     patch: dict[str, Any] = {}
     if isinstance(req.theme, dict):
         patch["theme"] = req.theme
@@ -500,26 +694,17 @@ class AuraSyncToJmRequest(BaseModel):
 
 
 @app.get("/api/aura/library/summary")
-def aura_library_summary(request: Request):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+def aura_library_summary(u: str = Depends(require_site_user)):
     return ok(aura_summary(u), msg="")
 
 
 @app.get("/api/aura/library/history")
-def aura_library_history(request: Request, limit: int = 50):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+def aura_library_history(u: str = Depends(require_site_user), limit: int = 50):
     return ok(aura_list_history(u, limit=limit), msg="")
 
 
 @app.post("/api/aura/library/history")
-def aura_library_history_push(req: AuraHistoryPushRequest, request: Request):
-    u = get_site_user(request)
-    if not u:
-        return JSONResponse(err(Status.NotLogin, "Not authenticated"), status_code=401)
+def aura_library_history_push(req: AuraHistoryPushRequest, u: str = Depends(require_site_user)):
     try:
         aura_push_history(
             u,
@@ -562,30 +747,37 @@ def jm_register_captcha(request: Request):
     base = str(GlobalConfig.Url.value or "").strip()
     if not base:
         return err(Status.Error, "Missing JM web base url")
-    s = _get_jm_register_session(client_ip)
+    s, jar = _get_jm_register_session(client_ip)
     try:
-        try:
-            s.get(f"{base}/login", headers=_jm_web_headers(f"{base}/login"), timeout=8, allow_redirects=True)
-        except Exception:
-            pass
-        r = s.get(f"{base}/captcha", headers=_jm_web_headers(f"{base}/signup"), timeout=12, allow_redirects=True)
-        if r.status_code >= 400:
-            return JSONResponse(status_code=502, content={"st": Status.Error, "msg": f"验证码获取失败: HTTP {r.status_code}"})
-        ct = str(r.headers.get("content-type") or "").lower()
-        if not ct.startswith("image/"):
-            body_preview = ""
+        # Only a fresh jar needs the /login visit to pick up the site's session cookies.
+        if not jar:
             try:
-                body_preview = r.text[:200].strip()
+                r = s.get(f"{base}/login", headers=_jm_web_headers(f"{base}/login"), cookies=jar, timeout=8, allow_redirects=True)
+                _merge_jm_cookies(jar, r)
             except Exception:
+                pass
+        r = s.get(f"{base}/captcha", headers=_jm_web_headers(f"{base}/signup"), cookies=jar, timeout=12, allow_redirects=True, stream=True)
+        _merge_jm_cookies(jar, r)
+        ct = str(r.headers.get("content-type") or "").lower()
+        if r.status_code >= 400 or not ct.startswith("image/"):
+            try:
+                if r.status_code >= 400:
+                    return JSONResponse(status_code=502, content={"st": Status.Error, "msg": f"验证码获取失败: HTTP {r.status_code}"})
                 body_preview = ""
-            return JSONResponse(
-                status_code=502,
-                content={
-                    "st": Status.Error,
-                    "msg": body_preview or f"验证码返回格式异常: {ct or 'unknown'}",
-                },
-            )
-        return StreamingResponse(io.BytesIO(r.content), media_type=ct)
+                try:
+                    body_preview = r.text[:200].strip()
+                except Exception:
+                    body_preview = ""
+                return JSONResponse(
+                    status_code=502,
+                    content={
+                        "st": Status.Error,
+                        "msg": body_preview or f"验证码返回格式异常: {ct or 'unknown'}",
+                    },
+                )
+            finally:
+                r.close()
+        return StreamingResponse(r.iter_content(chunk_size=8192), media_type=ct, background=BackgroundTask(r.close))
     except Exception as e:
         return err(Status.Error, str(e) or "Captcha fetch failed")
 
@@ -593,11 +785,11 @@ def jm_register_captcha(request: Request):
 @app.post("/api/jm/register")
 def jm_register(req: JmWebRegisterRequest, request: Request):
     client_ip = request.client.host if request.client else "anon"
-    u = str(req.username or "").strip()
-    em = str(req.email or "").strip()
+    u = _s(req.username)
+    em = _s(req.email)
     pw = str(req.password or "")
     pw2 = str(req.password_confirm or "")
-    ver = str(req.verification or "").strip()
+    ver = _s(req.verification)
     gender = str(req.gender or "Male").strip()
     if gender not in ("Male", "Female"):
         gender = "Male"
@@ -610,7 +802,7 @@ def jm_register(req: JmWebRegisterRequest, request: Request):
     if not base:
         return err(Status.Error, "Missing JM web base url")
 
-    s = _get_jm_register_session(client_ip)
+    s, jar = _get_jm_register_session(client_ip)
     url = f"{base}/signup"
     data = {
         "username": u,
@@ -626,16 +818,16 @@ def jm_register(req: JmWebRegisterRequest, request: Request):
     try:
         headers = _jm_web_headers(url)
         headers["content-type"] = "application/x-www-form-urlencoded"
-        r = s.post(url, data=data, headers=headers, timeout=18, allow_redirects=True)
+        r = s.post(url, data=data, headers=headers, cookies=jar, timeout=18, allow_redirects=True)
+        _merge_jm_cookies(jar, r)
         hist = list(getattr(r, "history", []) or [])
         if hist:
             return ok({"status": "success"}, msg="")
         final_url = str(getattr(r, "url", "") or "")
         if final_url and final_url != url:
             return ok({"status": "success"}, msg="")
-        txt = str(getattr(r, "text", "") or "")
-        m = re.search(r"<title[^>]*>(.*?)</title>", txt, flags=re.IGNORECASE | re.DOTALL)
-        title = (m.group(1).strip() if m else "")[:120]
+        m = _TITLE_RE.search(r.content or b"")
+        title = (m.group(1).decode("utf-8", "replace").strip() if m else "")[:120]
         if not title:
             title = "Register failed"
         return err(Status.UserError, title)
@@ -732,27 +924,21 @@ class CommentLikeRequest(BaseModel):
 class DownloadManager:
     def __init__(self, max_concurrent: int = 3):
         self.max_concurrent = max_concurrent
-        self.queue: Queue[tuple[str, list[str] | None]] = Queue()
-        self._sema = threading.Semaphore(max_concurrent)
-        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self._worker_thread.start()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="dl")
 
     def add_task(self, album_id: str, chapter_ids: list[str] | None = None) -> None:
-        self.queue.put((album_id, chapter_ids))
+        fut = self._pool.submit(jm_service.download_album, album_id, chapter_ids)
+        fut.add_done_callback(self._report)
 
-    def _worker(self) -> None:
-        while True:
-            album_id, chapter_ids = self.queue.get()
-            self._sema.acquire()
-            try:
-                jm_service.download_album(album_id, chapter_ids)
-            finally:
-                self._sema.release()
-                self.queue.task_done()
+    @staticmethod
+    def _report(fut) -> None:
+        exc = fut.exception()
+        if exc is not None:
+            print(f"[Download] album download failed: {exc}")
 
 
 download_manager = DownloadManager(max_concurrent=3)
-download_task_manager = DownloadTaskManager(base_dir=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "downloads", "tasks"))
+download_task_manager = DownloadTaskManager(base_dir=_TASKS_DIR)
 
 
 @app.post("/api/config")
@@ -773,6 +959,7 @@ async def update_config(config: ConfigRequest, request: Request):
             set_credentials(config.username, config.password, user=site_u)
         except Exception:
             pass
+        _drop_cred_cache(site_u)
     else:
         # Note: the user asked to always save password for auto re-login
         # but config API might be used for toggling settings. We will keep
@@ -781,23 +968,7 @@ async def update_config(config: ConfigRequest, request: Request):
 
     if isinstance(data, dict):
         set_user_profile(data)
-        uid = None
-        for k in ("uid", "user_id", "id"):
-            v = data.get(k)
-            if v:
-                uid = str(v)
-                break
-        if not uid:
-            for k in ("user", "userinfo", "profile", "member"):
-                sub = data.get(k)
-                if isinstance(sub, dict):
-                    for kk in ("uid", "user_id", "id"):
-                        vv = sub.get(kk)
-                        if vv:
-                            uid = str(vv)
-                            break
-                if uid:
-                    break
+        uid = _extract_uid(data)
         if uid:
             set_user_id(uid)
 
@@ -809,7 +980,7 @@ def api_get_credentials_meta(request: Request):
     site_u = get_site_user(request)
     if not site_u:
         return {"has_saved": False, "username": "", "st": Status.Ok, "msg": ""}
-    u = get_username(user=site_u)
+    u = _saved_username(site_u)
     return {"has_saved": bool(has_credentials(user=site_u)), "username": u, "st": Status.Ok, "msg": ""}
 
 
@@ -822,6 +993,7 @@ def api_clear_credentials(request: Request):
         clear_credentials(user=site_u)
     except Exception:
         pass
+    _drop_cred_cache(site_u)
     return {"status": "success", "st": Status.Ok, "msg": ""}
 
 
@@ -831,11 +1003,11 @@ async def session_relogin(req: ReloginRequest, request: Request):
     if not site_u0:
         return JSONResponse(err(Status.NotLogin, "Aura login required"), status_code=401)
     
-    u = str(req.username or "").strip()
-    p = str(req.password or "").strip()
+    u = _s(req.username)
+    p = _s(req.password)
     
     if not u or not p:
-        target_u = u or get_username(user=site_u0)
+        target_u = u or _saved_username(site_u0)
         if target_u:
             saved_u, saved_p = get_credentials(user=site_u0)
             if saved_p:
@@ -851,23 +1023,7 @@ async def session_relogin(req: ReloginRequest, request: Request):
 
         if isinstance(data, dict):
             set_user_profile(data)
-            uid = None
-            for k in ("uid", "user_id", "id"):
-                v = data.get(k)
-                if v:
-                    uid = str(v)
-                    break
-            if not uid:
-                for k in ("user", "userinfo", "profile", "member"):
-                    sub = data.get(k)
-                    if isinstance(sub, dict):
-                        for kk in ("uid", "user_id", "id"):
-                            vv = sub.get(kk)
-                            if vv:
-                                uid = str(vv)
-                                break
-                    if uid:
-                        break
+            uid = _extract_uid(data)
             if uid:
                 set_user_id(uid)
 
@@ -875,15 +1031,39 @@ async def session_relogin(req: ReloginRequest, request: Request):
     except Exception:
         return err(Status.NotLogin, "Relogin failed")
 
+_UID_KEYS = ("uid", "user_id", "id")
+_UID_CONTAINER_KEYS = ("user", "userinfo", "profile", "member")
+
+
+def _extract_uid(data: dict[str, Any]) -> str | None:
+    # Login payloads put the id at the top level or under one of a few wrapper objects.
+    for k in _UID_KEYS:
+        v = data.get(k)
+        if v:
+            return str(v)
+    for k in _UID_CONTAINER_KEYS:
+        sub = data.get(k)
+        if not isinstance(sub, dict):
+            continue
+        for kk in _UID_KEYS:
+            v = sub.get(kk)
+            if v:
+                return str(v)
+    return None
+
+
 def _get_saved_jm_credentials(user: str | None = None) -> tuple[str, str]:
-    try:
-        active_u = get_username(user=user)
-        if not active_u:
+    def _load() -> tuple[str, str]:
+        try:
+            active_u = get_username(user=user)
+            if not active_u:
+                return "", ""
+            saved_u, saved_p = get_credentials(user=user, jm_username=active_u)
+            return str(saved_u or active_u or "").strip(), str(saved_p or "").strip()
+        except Exception:
             return "", ""
-        saved_u, saved_p = get_credentials(user=user, jm_username=active_u)
-        return str(saved_u or active_u or "").strip(), str(saved_p or "").strip()
-    except Exception:
-        return "", ""
+
+    return _cred_cached("saved", user, _load)
 
 
 def _relogin_from_saved_config(user: str | None = None) -> bool:
@@ -895,23 +1075,7 @@ def _relogin_from_saved_config(user: str | None = None) -> bool:
         save_cookies()
         if isinstance(data, dict):
             set_user_profile(data)
-            uid = None
-            for k in ("uid", "user_id", "id"):
-                v = data.get(k)
-                if v:
-                    uid = str(v)
-                    break
-            if not uid:
-                for k in ("user", "userinfo", "profile", "member"):
-                    sub = data.get(k)
-                    if isinstance(sub, dict):
-                        for kk in ("uid", "user_id", "id"):
-                            vv = sub.get(kk)
-                            if vv:
-                                uid = str(vv)
-                                break
-                    if uid:
-                        break
+            uid = _extract_uid(data)
             if uid:
                 set_user_id(uid)
         return True
@@ -922,7 +1086,7 @@ def _relogin_from_saved_config(user: str | None = None) -> bool:
 @app.get("/api/config")
 async def get_config():
     try:
-        u = get_username()
+        u = _saved_username()
     except Exception:
         u = ""
     try:
@@ -935,6 +1099,7 @@ async def get_config():
 @app.post("/api/logout")
 async def logout():
     clear_cookies()
+    _drop_cred_cache()
     set_user_id(None)
     set_user_profile({})
     try:
@@ -944,6 +1109,10 @@ async def logout():
     return {"status": "success", "message": "Logged out", "st": Status.Ok, "msg": ""}
 
 
+# One pydantic-core call per list instead of a Python-level model_dump() per item.
+_COMIC_SUMMARIES = TypeAdapter(list[ComicSummary])
+
+
 def _v2_ok(data: Any) -> dict[str, Any]:
     return ok(data, msg="")
 
@@ -1071,7 +1240,7 @@ def v2_search(
             translation=translation,
             sort=sort,
         )
-        return _v2_ok([x.model_dump() for x in items])
+        return _v2_ok(_COMIC_SUMMARIES.dump_python(items))
     except Exception as e:
         return _v2_err(e)
 
@@ -1081,7 +1250,7 @@ def v2_leaderboard(source: str, days: str | None = None, category: str | None =
     try:
         p = get_provider(source)  # type: ignore[arg-type]
         items = p.leaderboard(days=days, category=category, page=page, sort=sort, tag=tag)
-        return _v2_ok([x.model_dump() for x in items])
+        return _v2_ok(_COMIC_SUMMARIES.dump_python(items))
     except Exception as e:
         return _v2_err(e)
 
@@ -1101,7 +1270,7 @@ def v2_also_viewed(source: str, comic_id: str):
     try:
         p = get_provider(source)  # type: ignore[arg-type]
         items = p.also_viewed(comic_id)
-        return _v2_ok([x.model_dump() for x in items])
+        return _v2_ok(_COMIC_SUMMARIES.dump_python(items))
     except Exception as e:
         return _v2_err(e)
 
@@ -1245,49 +1414,70 @@ def v2_download_task_zip(source: str, task_id: str):
 
 @app.post("/api/v2/cache/cleanup")
 def v2_cache_cleanup(keep_days: int = 7):
-    bases = [
-        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "downloads", "tasks"),
-    ]
+    bases = [_TASKS_DIR]
     now = time.time()
     removed_dirs = 0
     removed_work = 0
+    to_remove: list[str] = []
     for base in bases:
-        if not os.path.isdir(base):
+        try:
+            with os.scandir(base) as it:
+                tasks = [e for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError:
             continue
-        for name in os.listdir(base):
-            p = os.path.join(base, name)
-            if not os.path.isdir(p):
-                continue
+        for entry in tasks:
             try:
-                mtime = os.path.getmtime(p)
-            except Exception:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
                 mtime = now
-            work = os.path.join(p, "work")
-            if os.path.isdir(work):
-                shutil.rmtree(work, ignore_errors=True)
+            # One listing of the task dir answers both "has work/" and "has zips/".
+            try:
+                with os.scandir(entry.path) as it:
+                    subdirs = {c.name: c.path for c in it if c.name in ("work", "zips") and c.is_dir()}
+            except OSError:
+                continue
+            work = subdirs.get("work")
+            if work:
                 removed_work += 1
-            if now - mtime > max(0, keep_days) * 86400:
-                zips = os.path.join(p, "zips")
-                if os.path.isdir(zips) and os.listdir(zips):
-                    continue
-                shutil.rmtree(p, ignore_errors=True)
+            expired = now - mtime > max(0, keep_days) * 86400
+            if expired and subdirs.get("zips"):
+                try:
+                    with os.scandir(subdirs["zips"]) as it:
+                        expired = not any(True for _ in it)
+                except OSError:
+                    pass
+            if expired:
+                # Removing the task dir takes its work/ with it.
+                to_remove.append(entry.path)
                 removed_dirs += 1
+            elif work:
+                to_remove.append(work)
+    if to_remove:
+        # Independent trees and unlink-bound, so threads overlap the syscalls well.
+        with ThreadPoolExecutor(max_workers=min(8, len(to_remove)), thread_name_prefix="cache-rm") as pool:
+            list(pool.map(functools.partial(shutil.rmtree, ignore_errors=True), to_remove))
     return ok({"removed_dirs": removed_dirs, "removed_work": removed_work}, msg="")
 
 
 @app.get("/api/promote")
 def get_promote(page: str = "0"):
     try:
-        now = time.time()
-        with _PROMOTE_CACHE_LOCK:
+        hit = _PROMOTE_CACHE.get(page)
+        if hit and (time.time() - hit[0]) <= _PROMOTE_TTL_SEC:
+            return _json_bytes_response(hit[1])
+        # Concurrent misses on the same page wait for one upstream fetch instead of each doing it.
+        with _PROMOTE_FETCH_LOCKS[hash(page) % len(_PROMOTE_FETCH_LOCKS)]:
             hit = _PROMOTE_CACHE.get(page)
-            if hit and (now - hit[0]) <= _PROMOTE_TTL_SEC:
-                return copy.deepcopy(hit[1])
-        data = GetIndexInfoReq2(page).execute()
-        now = time.time()
-        with _PROMOTE_CACHE_LOCK:
-            _PROMOTE_CACHE[page] = (now, data)
-        return data
+            if hit and (time.time() - hit[0]) <= _PROMOTE_TTL_SEC:
+                return _json_bytes_response(hit[1])
+            # Cache the encoded body: hits then cost neither a deepcopy nor a re-serialisation.
+            body = _DefaultJSONResponse(GetIndexInfoReq2(page).execute()).body
+            now = time.time()
+            with _PROMOTE_CACHE_LOCK:
+                _PROMOTE_CACHE.pop(page, None)
+                _PROMOTE_CACHE[page] = (now, body)
+                _evict_expired(_PROMOTE_CACHE, now, _PROMOTE_TTL_SEC, _PROMOTE_CACHE_MAX)
+            return _json_bytes_response(body)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1305,7 +1495,7 @@ def search(q: str, page: int = 1):
     try:
         q2 = (q or "").strip()
         q_low = q2.lower().strip()
-        m = re.fullmatch(r"(?:jm\s*)?(\d{3,})", q_low)
+        m = _SEARCH_ID_RE.fullmatch(q_low)
         if m and page == 1:
             album_id = m.group(1)
             try:
@@ -1350,25 +1540,20 @@ def get_album(album_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _image_basename(s: str) -> str:
+    # Plain string splits instead of urlparse; chapters carry a few hundred of these.
+    if s.startswith(("http://", "https://")):
+        s = s.split("#", 1)[0].split("?", 1)[0]
+    return s.rsplit("/", 1)[-1]
+
+
 @app.get("/api/chapter/{photo_id}")
 def get_chapter(photo_id: str, album_id: str | None = None, eps_index: int = 0):
     try:
         try:
             data = jm_service.get_chapter_detail(photo_id)
             images = data.get("images") or []
-            out_images: list[str] = []
-            for x in images:
-                s = str(x or "")
-                if not s:
-                    continue
-                if s.startswith("http://") or s.startswith("https://"):
-                    try:
-                        out_images.append(urlparse(s).path.rsplit("/", 1)[-1])
-                    except Exception:
-                        out_images.append(s.rsplit("/", 1)[-1])
-                else:
-                    out_images.append(s.rsplit("/", 1)[-1])
-            data["images"] = out_images
+            data["images"] = [_image_basename(str(x)) for x in images if x]
         except Exception:
             chapter_raw = GetBookEpsInfoReq2(album_id or "0", photo_id).execute()
             tpl_raw = GetBookEpsScrambleReq2(album_id or "0", eps_index, photo_id).execute()
@@ -1410,31 +1595,43 @@ def get_favorites(page: int = 1, folder_id: str = "0"):
 
 @app.get("/api/favorites/sync")
 def sync_favorites(max_pages: int = 20, folder_id: str = "0"):
-    def _run() -> dict:
+    def _page_ids(page: int) -> tuple[dict, list[str]]:
+        r = GetFavoritesReq2(page=page, fid=folder_id)
+        r.no_cache = True
+        data = adapt_favorites(r.execute())
         ids: list[str] = []
-        folders: list[dict] = []
-        pages = 1
-        page = 1
+        content = data.get("content") or []
+        if isinstance(content, list):
+            for it in content:
+                if isinstance(it, dict):
+                    aid = _s(it.get("album_id"))
+                    if aid:
+                        ids.append(aid)
+        return data, ids
+
+    def _run() -> dict:
         safe_max = max(1, min(int(max_pages or 1), 50))
-        while page <= safe_max:
-            raw = GetFavoritesReq2(page=page, fid=folder_id).execute()
-            data = adapt_favorites(raw)
-            if page == 1:
-                folders = data.get("folders") or []
-                pages = int(data.get("pages") or 1)
-            content = data.get("content") or []
-            if isinstance(content, list):
-                for it in content:
-                    if isinstance(it, dict):
-                        aid = str(it.get("album_id") or "").strip()
-                        if aid:
-                            ids.append(aid)
-            if page >= pages:
-                break
-            if not content:
-                break
-            page += 1
-        uniq = sorted(set(ids))
+        data, ids = _page_ids(1)
+        folders = data.get("folders") or []
+        pages = int(data.get("pages") or 1)
+        last = min(pages, safe_max)
+        if ids and last > 1:
+            # Pages are independent GETs; fetch the rest concurrently, each worker carrying
+            # this request's JM identity/session contextvars.
+            with ThreadPoolExecutor(max_workers=min(8, last - 1), thread_name_prefix="fav-sync") as pool:
+                futs = [pool.submit(contextvars.copy_context().run, _page_ids, p) for p in range(2, last + 1)]
+                # Merge in page order and stop at the first empty page, as the serial walk did.
+                try:
+                    for fut in futs:
+                        chunk = fut.result()[1]
+                        if not chunk:
+                            break
+                        ids.extend(chunk)
+                finally:
+                    # Pages past an empty one (or a failed one) are not needed; don't wait for them.
+                    pool.shutdown(wait=True, cancel_futures=True)
+        # Server order, deduplicated; neither the store nor the frontend relies on sorting.
+        uniq = list(dict.fromkeys(ids))
         set_favorite_ids(uniq)
         return {"ids": uniq, "folders": folders, "pages": pages, "st": Status.Ok, "msg": ""}
 
@@ -1501,6 +1698,7 @@ def favorite_folder(req: FavoriteFolderRequest):
         def _fetch_folders() -> list[dict]:
             r0 = GetFavoritesReq2(page=1, fid="0")
             r0.timeout = 4
+            r0.no_cache = True
             raw0 = r0.execute()
             d0 = adapt_favorites(raw0)
             folders0 = d0.get("folders") or []
@@ -1514,7 +1712,7 @@ def favorite_folder(req: FavoriteFolderRequest):
             return None
 
         if t == "add":
-            name = str(req.folder_name or "").strip()
+            name = _s(req.folder_name)
             if not name:
                 return err(Status.UserError, "Missing folder_name")
             r_add = AddFavoritesFoldReq2(name)
@@ -1538,7 +1736,7 @@ def favorite_folder(req: FavoriteFolderRequest):
                 time.sleep(0.3)
             return err(Status.Error, "Folder add not applied", data={"result": raw, "folders": folders, "error": last_err})
         elif t == "del":
-            fid = str(req.folder_id or "").strip()
+            fid = _s(req.folder_id)
             if not fid or fid == "0":
                 return err(Status.UserError, "Invalid folder_id")
             r_del = DelFavoritesFoldReq2(fid)
@@ -1575,6 +1773,9 @@ def favorite_folder(req: FavoriteFolderRequest):
                     raw = raw2
             fid0 = str(fid or "").strip()
             name0 = str(name or "").strip()
+            if not fid0 or fid0 == "0" or not name0:
+                # No folder can match these, so polling page 1 for the rename would only burn requests.
+                return err(Status.UserError, "Invalid folder_id or folder_name", data={"result": raw, "folders": []})
             folders = []
             last_err = ""
             errors = 0
@@ -1593,9 +1794,6 @@ def favorite_folder(req: FavoriteFolderRequest):
                         break
                 time.sleep(0.3)
 
-            if not fid0 or fid0 == "0" or not name0:
-                return err(Status.UserError, "Invalid folder_id or folder_name", data={"result": raw, "folders": folders})
-
             r_add2 = AddFavoritesFoldReq2(name0)
             r_add2.timeout = 6
             emu_add_raw = r_add2.execute()
@@ -1630,41 +1828,57 @@ def favorite_folder(req: FavoriteFolderRequest):
             try:
                 r_f1 = GetFavoritesReq2(page=1, fid=fid0)
                 r_f1.timeout = 6
+                r_f1.no_cache = True
                 raw_first = r_f1.execute()
                 d_first = adapt_favorites(raw_first)
                 total = int(d_first.get("total") or 0)
                 if total > 200:
                     return err(Status.Error, "Folder too large to migrate automatically", data={"result": raw, "new_folder_id": new_fid, "total": total})
 
-                old_page = 1
-                moved = 0
+                # Collect first: moving while paging shifts later items onto pages already read.
                 max_moves = 220
-                while moved < max_moves:
+                aids: list[str] = []
+                old_page = 1
+                while len(aids) < max_moves:
                     if old_page == 1:
                         d_f = d_first
                     else:
                         r_fp = GetFavoritesReq2(page=old_page, fid=fid0)
                         r_fp.timeout = 6
+                        r_fp.no_cache = True
                         d_f = adapt_favorites(r_fp.execute())
                     items = d_f.get("content") or []
                     if not isinstance(items, list) or not items:
                         break
                     for it in items:
-                        if moved >= max_moves:
-                            break
                         if not isinstance(it, dict):
                             continue
-                        aid = str(it.get("album_id") or "").strip()
-                        if not aid:
-                            continue
-                        r_mv = MoveFavoritesFoldReq2(aid, new_fid)
-                        r_mv.timeout = 6
-                        r_mv.execute()
-                        moved += 1
+                        aid = _s(it.get("album_id"))
+                        if aid:
+                            aids.append(aid)
                     pages = int(d_f.get("pages") or 1)
                     if old_page >= pages:
                         break
                     old_page += 1
+                # An album can surface on two pages if the folder changes while we read it.
+                aids = list(dict.fromkeys(aids))[:max_moves]
+
+                def _move(aid: str) -> None:
+                    r_mv = MoveFavoritesFoldReq2(aid, new_fid)
+                    r_mv.timeout = 6
+                    r_mv.execute()
+
+                if aids:
+                    # JM rate-limits writes harder than reads, so keep this pool small.
+                    with ThreadPoolExecutor(max_workers=min(4, len(aids)), thread_name_prefix="fav-move") as pool:
+                        futs = [pool.submit(contextvars.copy_context().run, _move, a) for a in aids]
+                        try:
+                            for fut in futs:
+                                fut.result()
+                        except Exception:
+                            # Abort like the serial loop did: drop queued moves instead of waiting them out.
+                            pool.shutdown(wait=True, cancel_futures=True)
+                            raise
 
                 r_del2 = DelFavoritesFoldReq2(fid0)
                 r_del2.timeout = 6
@@ -1932,7 +2146,7 @@ def download_task_zip(task_id: str):
     return FileResponse(task.zip_path, filename=os.path.basename(task.zip_path), media_type="application/zip")
 
 
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = _REPO_ROOT
 frontend_path = os.path.join(project_root, "frontend")
 
 